@@ -0,0 +1,18 @@
+import os
+from typing import List
+
+import discord
+from dotenv import load_dotenv
+
+RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
+
+if not RUNNING_IN_DOCKER:
+    load_dotenv()
+
+AUTHORIZED_USERS: List[int] = [
+    int(user_id) for user_id in os.getenv("DISCORD_AUTHORIZED_USERS", "").split(",") if user_id
+]
+
+def is_authorized(interaction: discord.Interaction) -> bool:
+    """Check if the user is authorized to execute privileged commands."""
+    return interaction.user.id in AUTHORIZED_USERS
@@ -5,13 +5,19 @@ import time
 import json
 import os
 import logging
+import hashlib
+import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from discord import app_commands
-from main import is_authorized
+from auth import is_authorized
+from services.circuit_breaker import CircuitBreaker
+from services.emby_client import EmbyClient
+from services.emby_websocket import EmbySessionTracker
+from services.singleflight import SingleFlight
+from services.scheduler import AdaptiveInterval, PollScheduler, PollSnapshot
 import asyncio
-import aiohttp
 
 # Library name to emoji mapping with priority order
 LIBRARY_EMOJIS = {
@@ -159,6 +165,9 @@ EMBY_GREEN = discord.Color.from_rgb(82, 181, 75)
 EMBY_LOGO_LARGE = "https://emby.media/resources/Emby_icon_512.png"
 EMBY_LOGO_SMALL = "https://emby.media/resources/Emby_icon_128.png"
 
+# "HH:MM" durations in the server status field; the minutes are left out of the dashboard fingerprint
+UPTIME_MINUTES = re.compile(r"\b(\d{2}):\d{2}\b")
+
 RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 
 if not RUNNING_IN_DOCKER:
@@ -167,6 +176,11 @@ if not RUNNING_IN_DOCKER:
 class EmbyCore(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.http_service = bot.http_service  # Shared pooled HTTP transport
+        self.state_store = bot.state_store  # Persistent state (message ID, snapshots)
+        self.presence = bot.presence_manager  # Deduplicated, rate-aware presence updates
+        self.scheduler: PollScheduler = bot.poll_scheduler  # One collection cycle shared by every consumer
+        self._presence_state: Optional[str] = None  # "online", "offline" or "error"
         self.logger = logging.getLogger("embywatch_bot.emby")
 
         # Load environment variables
@@ -175,11 +189,6 @@ class EmbyCore(commands.Cog):
         self.EMBY_USERNAME = os.getenv("EMBY_USERNAME")
         self.EMBY_PASSWORD = os.getenv("EMBY_PASSWORD")
         channel_id = os.getenv("CHANNEL_ID")
-        
-        # Authentication variables
-        self.auth_token = None  # Store the auth token from Emby
-        self.token_expiry = None  # Token expiration timestamp
-        self.user_id = None  # Emby user ID after authentication
         if channel_id is None:
             self.logger.error("CHANNEL_ID not set in .env file")
             raise ValueError("CHANNEL_ID must be set in .env")
@@ -193,20 +202,91 @@ class EmbyCore(commands.Cog):
 
         # Initialize state
         self.config = self._load_config()
+
+        # Authenticated API client (holds the token and re-authenticates on 401);
+        # its circuit breaker fails requests fast while the server is unreachable
+        breaker_config = self.config.get("circuit_breaker", {})
+        self.emby = EmbyClient(
+            self.http_service, self.EMBY_URL, self.EMBY_API_KEY, self.EMBY_USERNAME, self.EMBY_PASSWORD,
+            breaker=CircuitBreaker.from_config("Emby", breaker_config),
+            probe_timeout=float(breaker_config.get("probe_timeout", 3)),
+        )
         self.emby_start_time: Optional[float] = None
         self.dashboard_message_id = self._load_message_id()
+        # Fingerprint of the last published embed; unchanged embeds are not re-sent until max staleness
+        self._dashboard_fingerprint: Optional[str] = None
+        self._dashboard_published_at: Optional[float] = None
+        self.dashboard_max_staleness = float(self.config.get("dashboard", {}).get("max_staleness", 900))
+        # Cycles can run every 10s; the dashboard is published at most this often unless forced
+        self.dashboard_min_interval = float(self.config.get("dashboard", {}).get("min_interval", 60))
+        self._dashboard_channel: Optional[discord.TextChannel] = None
         self.last_scan = datetime.now()
-        self.offline_since: Optional[datetime] = None
+        offline_since = self.state_store.get("emby", "offline_since")
+        self.offline_since: Optional[datetime] = datetime.fromtimestamp(offline_since) if offline_since else None
         self.stream_debug = False
+        self._flights = SingleFlight()  # Coalesces concurrent server info / library fetches
 
         # Cache settings
         self.library_cache: Dict[str, Dict[str, Any]] = {}
         self.last_library_update: Optional[datetime] = None
         self.library_update_interval = self.config.get("cache", {}).get("library_update_interval", 900)
+        # Past the soft TTL the snapshot is still served but revalidated in the background;
+        # only past the hard TTL (or with no snapshot at all) does a caller wait for a rescan
+        self.library_soft_ttl = float(self.config.get("cache", {}).get("library_soft_ttl", self.library_update_interval * 0.8))
+        self.library_hard_ttl = float(self.config.get("cache", {}).get("library_hard_ttl", self.library_update_interval * 3))
+        self._library_refresh_task: Optional[asyncio.Task] = None
+        # Bumped when the library display config changes; rescans started before that are discarded
+        self._library_generation = 0
+
+        # Restore the last snapshots so a cold start can render without waiting on Emby
+        self.last_server_info: Dict[str, Any] = self.state_store.get("emby", "server_info", {})
+        self._restore_library_snapshot()
+        self.library_concurrency = max(1, int(self.config.get("cache", {}).get("library_concurrency", 4)))
+        # Never cut a library scan shorter than the emby_library timeout class it already runs under
+        self.library_timeout = max(
+            float(self.config.get("cache", {}).get("library_timeout", 0)),
+            self.http_service.timeout("emby_library").total or 0,
+        )
+
+        # Optional push-based session tracking; polling stays as the fallback
+        self.session_tracker: Optional[EmbySessionTracker] = None
+        websocket_config = self.config.get("emby_websocket", {})
+        if int(websocket_config.get("enabled", 0)):
+            self.session_tracker = EmbySessionTracker(
+                self.emby,
+                sessions_interval=float(websocket_config.get("sessions_interval", 1.5)),
+                reconcile_interval=float(websocket_config.get("reconcile_interval", 300)),
+            )
+
+        # Poll faster while people are watching, back off when idle or offline
+        polling_config = self.config.get("polling", {})
+        self.poll_interval = AdaptiveInterval.from_config("cycle", polling_config, floor=10, ceiling=120)
+        self.last_sessions: List[Dict[str, Any]] = []
+        self._force_dashboard = False
+
+        # Emby is collected by the shared scheduler; presence and dashboard consume its snapshots
+        emby_deadline = float(polling_config.get("emby_deadline", 15))
+        self.scheduler.add_collector("emby_system_info", self._collect_system_info, deadline=emby_deadline)
+        self.scheduler.add_collector("emby_sessions", self._collect_sessions, deadline=emby_deadline)
+        self.scheduler.add_consumer("presence", self._publish_presence)
+        self.scheduler.add_consumer("dashboard", self._publish_dashboard)
 
         self.user_mapping = self._load_user_mapping()
-        self.update_status.start()
-        self.update_dashboard.start()
+        self.poll_cycle.start()
+        if self.session_tracker:
+            self.session_tracker.start()
+
+    def cog_unload(self) -> None:
+        """Stop background loops; the shared HTTP pool is owned by the bot."""
+        self.poll_cycle.cancel()
+        for name in ("emby_system_info", "emby_sessions"):
+            self.scheduler.remove_collector(name)
+        for name in ("presence", "dashboard"):
+            self.scheduler.remove_consumer(name)
+        if self._library_refresh_task:
+            self._library_refresh_task.cancel()
+        if self.session_tracker:
+            self.session_tracker.stop()
 
     def _format_size(self, size_bytes: int) -> str:
         """Convert bytes to a human-readable format."""
@@ -226,7 +306,13 @@ class EmbyCore(commands.Cog):
                 "offline_text": "🔴 Server Offline!",
                 "stream_text": "{count} active Stream{s} 🟢",
             },
-            "cache": {"library_update_interval": 900},
+            "cache": {"library_update_interval": 900, "library_concurrency": 4},
+            "emby_websocket": {"enabled": 0, "sessions_interval": 1.5, "reconcile_interval": 300},
+            "circuit_breaker": {"failure_threshold": 3, "base_delay": 10, "max_delay": 300, "probe_timeout": 3},
+            "polling": {
+                "cycle_floor": 10, "cycle_ceiling": 120, "backoff": 1.5, "active_window": 300,
+                "emby_deadline": 15, "cycle_deadline": 25, "max_stale": 600,
+            },
         }
         try:
             with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
@@ -245,24 +331,39 @@ class EmbyCore(commands.Cog):
             return default_config
 
     def _load_message_id(self) -> Optional[int]:
-        """Load the dashboard message ID from file."""
+        """Load the dashboard message ID from the state store.
+
+        Falls back to the legacy dashboard_message_id.json once and migrates it.
+        """
+        message_id = self.state_store.get("dashboard", "message_id")
+        if message_id is not None:
+            return int(message_id)
         if not os.path.exists(self.MESSAGE_ID_FILE):
             return None
         try:
             with open(self.MESSAGE_ID_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                return int(data.get("message_id"))
-        except (json.JSONDecodeError, ValueError) as e:
+                message_id = int(data.get("message_id"))
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
             self.logger.error(f"Failed to load message ID: {e}")
             return None
+        self._save_message_id(message_id)
+        self.logger.info("Migrated dashboard message ID to the state store")
+        return message_id
 
     def _save_message_id(self, message_id: int) -> None:
-        """Save the dashboard message ID to file."""
-        try:
-            with open(self.MESSAGE_ID_FILE, "w", encoding="utf-8") as f:
-                json.dump({"message_id": message_id}, f)
-        except OSError as e:
-            self.logger.error(f"Failed to save message ID: {e}")
+        """Persist the dashboard message ID."""
+        self.state_store.set("dashboard", "message_id", message_id)
+        self.state_store.flush()
+
+    def _restore_library_snapshot(self) -> None:
+        """Load the last persisted library stats into the in-memory cache."""
+        snapshot = self.state_store.get("emby", "library_snapshot")
+        if not snapshot:
+            return
+        self.library_cache = snapshot.get("stats", {})
+        self.last_library_update = datetime.fromtimestamp(snapshot.get("updated_at", 0))
+        self.logger.info(f"Restored library snapshot with {len(self.library_cache)} libraries")
 
     def _load_user_mapping(self) -> Dict[str, str]:
         """Load user mapping from JSON file."""
@@ -276,217 +377,177 @@ class EmbyCore(commands.Cog):
     async def connect_to_emby(self) -> bool:
         """Attempt to establish a connection to the Emby server.
         
-        This method handles authentication with the Emby server using either an API key
-        or username/password credentials. It stores the authentication token for reuse
-        and handles token renewal when needed.
+        Authentication is delegated to the EmbyClient, which keeps the token until
+        the server rejects it and then re-authenticates transparently. While the
+        circuit is open this returns False without a request unless a probe is due.
         """
         try:
-            # Check if we have a valid cached token
-            current_time = time.time()
-            if self.auth_token and self.token_expiry and current_time < self.token_expiry:
-                return True
-                
-            # Common headers for all requests
-            headers = {
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"EmbyWatch\", Device=\"EmbyWatch\", DeviceId=\"embywatch-bot\", Version=\"1.0.0\""
-            }
-
-            # First try with API key if available
-            if self.EMBY_API_KEY:
-                headers["X-Emby-Token"] = self.EMBY_API_KEY
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{self.EMBY_URL}/System/Info", headers=headers) as response:
-                        if response.status == 200:
-                            self.auth_token = self.EMBY_API_KEY
-                            # API keys don't expire
-                            self.token_expiry = float('inf')
-                            if self.emby_start_time is None:
-                                self.emby_start_time = time.time()
-                            self.logger.info("Successfully connected to Emby server using API key")
-                            return True
-                        elif response.status == 401:
-                            self.logger.error("Invalid API key provided")
-                            self.auth_token = None
-                            return False
-                        else:
-                            self.logger.error(f"Failed to connect with API key: HTTP {response.status}")
-                            return False
-
-            # If API key fails or not available, try username/password
-            if self.EMBY_USERNAME and self.EMBY_PASSWORD:
-                auth_data = {
-                    "Username": self.EMBY_USERNAME,
-                    "Pw": self.EMBY_PASSWORD
-                }
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.EMBY_URL}/Users/AuthenticateByName",
-                        json=auth_data,
-                        headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            # Parse authentication response
-                            auth_response = await response.json()
-                            self.auth_token = auth_response.get("AccessToken")
-                            self.user_id = auth_response.get("User", {}).get("Id")
-                            
-                            # Store token with expiration time (default 30 days)
-                            # Emby doesn't explicitly return token expiry, so we set our own reasonable duration
-                            self.token_expiry = time.time() + (30 * 24 * 60 * 60)  # 30 days in seconds
-                            
-                            if self.emby_start_time is None:
-                                self.emby_start_time = time.time()
-                                
-                            self.logger.info(f"Successfully authenticated with Emby server as {self.EMBY_USERNAME}")
-                            return True
-                        elif response.status == 401:
-                            self.logger.error("Invalid username or password")
-                            self.auth_token = None
-                            return False
-                        else:
-                            error_body = await response.text()
-                            self.logger.error(f"Failed to authenticate with username/password: HTTP {response.status}")
-                            self.logger.error(f"Error response: {error_body}")
-                            return False
-
-            self.logger.error("No authentication method provided (API key or username/password required)")
-            return False
+            if not await self.emby.ensure_available():
+                self.emby_start_time = None
+                return False
+            if not await self.emby.authenticate():
+                return False
+            if self.emby_start_time is None:
+                self.emby_start_time = time.time()
+            return True
         except Exception as e:
             self.logger.error(f"Failed to connect to Emby server: {e}", exc_info=True)
             self.emby_start_time = None
-            self.auth_token = None
             return False
 
     @tasks.loop(seconds=30)
-    async def update_status(self) -> None:
-        """Update bot's status with current stream count."""
-        self.logger.info("DEBUG: Entered NEW update_status method V4 - API call for sessions.")
+    async def poll_cycle(self) -> None:
+        """Run one collection cycle; presence and dashboard are updated from its snapshot."""
         try:
-            if not await self.connect_to_emby():
+            snapshot = await self.scheduler.run_cycle()
+            online = snapshot.get("emby_system_info") is not None and not self.emby.breaker.is_open
+            self.poll_cycle.change_interval(
+                seconds=self.poll_interval.observe(online, snapshot.get("emby_sessions"))
+            )
+        except Exception as e:
+            self.logger.error(f"Error running poll cycle: {e}", exc_info=True)
+
+    @poll_cycle.before_loop
+    async def before_poll_cycle(self) -> None:
+        """Cogs load in ``setup_hook``, before the gateway is up; presence and channels need it."""
+        await self.bot.wait_until_ready()
+
+    async def _collect_system_info(self) -> Dict[str, Any]:
+        """Collector: ``/System/Info``, raising when the server cannot be reached."""
+        if not await self.connect_to_emby():
+            raise ConnectionError("Failed to connect to Emby server")
+        response = await self.emby.get("/System/Info")
+        if response.status != 200:
+            raise ConnectionError(f"Failed to get system info: HTTP {response.status}")
+        self.logger.debug(f"Retrieved Emby system info: {response.data.get('ServerName')}")
+        return response.data
+
+    async def _collect_sessions(self) -> List[Dict[str, Any]]:
+        """Collector: current sessions, raising instead of reporting an empty list on failure."""
+        sessions = await self._fetch_sessions()
+        if sessions is None:
+            raise ConnectionError("Failed to get sessions")
+        return sessions
+
+    async def _publish_presence(self, snapshot: PollSnapshot) -> None:
+        """Consumer: update bot's status with current stream count."""
+        try:
+            # A stale value from a slow cycle still counts; the breaker decides when Emby is down
+            if self.emby.breaker.is_open or snapshot.get("emby_system_info") is None:
                 self.logger.warning("Cannot update status, Emby connection failed.")
-                await self.bot.change_presence(activity=discord.Game(name="Emby Offline"))
+                await self._set_presence(discord.Game(name="Emby Offline"), "offline")
                 return
 
-            headers = {
-                "X-Emby-Token": self.auth_token,
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-            }
-            
-            sessions_data = None
-            async with aiohttp.ClientSession() as http_session:
-                async with http_session.get(f"{self.EMBY_URL}/Sessions", headers=headers) as response:
-                    if response.status == 200:
-                        sessions_data = await response.json()
-                        if not isinstance(sessions_data, list):
-                            self.logger.error(f"Sessions endpoint did not return a list for status update: {type(sessions_data)}")
-                            sessions_data = None 
-                    else:
-                        self.logger.error(f"Failed to get sessions for status update: HTTP {response.status} - {await response.text()}")
-            
-            current_streams = len(sessions_data) if sessions_data else 0
+            current_streams = len(snapshot.get("emby_sessions") or [])
             activity = discord.Activity(
                 type=discord.ActivityType.watching,
                 name=f"{current_streams} stream{'s' if current_streams != 1 else ''}"
             )
-            await self.bot.change_presence(activity=activity)
+            await self._set_presence(activity, "online")
         except Exception as e:
             self.logger.error(f"Error updating status: {e}", exc_info=True)
             try:
-                await self.bot.change_presence(activity=discord.Game(name="Status Error"))
+                await self._set_presence(discord.Game(name="Status Error"), "error")
             except Exception as presence_e:
                 self.logger.error(f"Failed to set error presence: {presence_e}")
 
-    @tasks.loop(seconds=60)
-    async def update_dashboard(self) -> None:
-        """Update the dashboard message periodically."""
+    async def _set_presence(self, activity: discord.BaseActivity, state: str) -> None:
+        """Hand the activity to the presence manager; online/offline transitions are urgent."""
+        urgent = state != self._presence_state
+        self._presence_state = state
+        await self.presence.update(activity, urgent=urgent)
+
+    async def _publish_dashboard(self, snapshot: PollSnapshot) -> None:
+        """Consumer: update the dashboard message from the cycle's snapshot."""
+        force, self._force_dashboard = self._force_dashboard, False
+        if (
+            not force
+            and self._dashboard_published_at is not None
+            and time.monotonic() - self._dashboard_published_at < self.dashboard_min_interval
+        ):
+            return
         try:
-            info = await self.get_server_info()
-            if not info:
-                return
+            if self.emby.breaker.is_open:
+                info = self.get_offline_info()
+            else:
+                info = await self.get_server_info(snapshot)
+                if not info:
+                    return
 
-            channel = self.bot.get_channel(self.CHANNEL_ID)
+            channel = self.get_dashboard_channel()
             if not channel:
                 self.logger.error("Dashboard channel not found")
                 return
 
             embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
+            await self._update_dashboard_message(channel, embed, force=force)
         except Exception as e:
             self.logger.error(f"Error updating dashboard: {e}")
 
-    async def get_server_info(self) -> Dict[str, Any]:
-        """Get server information from Emby.
+    async def run_forced_cycle(self) -> PollSnapshot:
+        """Collect now and republish the dashboard even if its content is unchanged.
+
+        A cycle that is already running may have published before the request,
+        so it is waited out and a new cycle is started for the forced publish.
+        """
+        await self.scheduler.wait_idle()
+        self._force_dashboard = True
+        return await self.scheduler.run_cycle()
+
+    async def get_server_info(self, snapshot: Optional[PollSnapshot] = None) -> Dict[str, Any]:
+        """Get server information from a poll snapshot.
         
-        Retrieves general server information, session counts, and library statistics.
-        Uses cached auth token and follows Emby API specifications.
+        Combines system info, session counts and library statistics, plus the
+        SABnzbd queue and uptime when those cogs are collecting. Uses the latest
+        snapshot unless one is given, and runs a cycle if none exists yet.
         """
         try:
-            # Ensure we're authenticated
-            if not await self.connect_to_emby():
-                self.logger.error("Failed to connect to Emby server")
+            if snapshot is None:
+                snapshot = self.scheduler.latest or await self.scheduler.run_cycle()
+            system_info = snapshot.get("emby_system_info")
+            if system_info is None:
                 return {}
+                
+            # Sessions from this cycle (the websocket table when it is live)
+            sessions = snapshot.get("emby_sessions") or []
+            current_streams = len([s for s in sessions if s.get("NowPlayingItem")])
 
-            # Use the stored auth token
-            headers = {
-                "X-Emby-Token": self.auth_token,
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"EmbyWatch\", Device=\"EmbyWatch\", DeviceId=\"embywatch-bot\", Version=\"1.0.0\""
+            # Get library stats
+            library_stats = await self.get_library_stats()
+            total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
+            total_episodes = sum(int(episodes) for stats in library_stats.values() 
+                               if (episodes := stats.get("episodes")) is not None)
+
+            info = {
+                "server_name": system_info.get("ServerName", "Unknown Server"),
+                "version": system_info.get("Version", "Unknown Version"),
+                "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
+                "current_streams": current_streams,
+                "total_items": total_items,
+                "total_episodes": total_episodes,
+                "library_stats": library_stats,
+                "downloads": snapshot.get("sabnzbd"),
+                "downloads_today": snapshot.get("sabnzbd_history"),
+                "uptime_stats": snapshot.get("uptime"),
             }
 
-            async with aiohttp.ClientSession() as session:
-                # Get system info
-                async with session.get(f"{self.EMBY_URL}/System/Info", headers=headers) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get system info: HTTP {response.status}")
-                        return {}
-                    system_info = await response.json()
-                    self.logger.debug(f"Retrieved Emby system info: {system_info.get('ServerName')}")
-                
-                # Get sessions
-                sessions_response_json = None
-                async with session.get(f"{self.EMBY_URL}/Sessions", headers=headers) as sessions_response:
-                    if sessions_response.status == 200:
-                        sessions_response_json = await sessions_response.json()
-                        if not isinstance(sessions_response_json, list):
-                            self.logger.error(f"Sessions endpoint did not return a list: {type(sessions_response_json)}")
-                            sessions_response_json = None # Treat as error
-                        else:
-                            self.logger.debug(f"Retrieved {len(sessions_response_json)} session items from Emby.")
-                    else:
-                        self.logger.error(f"Failed to get sessions: HTTP {sessions_response.status} - {await sessions_response.text()}")
-                sessions = sessions_response_json # sessions will be None if there was an error or not a list
-                current_streams = len([s for s in sessions if s.get("NowPlayingItem")]) if sessions else 0
-
-                # Get library stats
-                library_stats = await self.get_library_stats()
-                total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
-                total_episodes = sum(int(episodes) for stats in library_stats.values() 
-                                   if (episodes := stats.get("episodes")) is not None)
-
-                return {
-                    "server_name": system_info.get("ServerName", "Unknown Server"),
-                    "version": system_info.get("Version", "Unknown Version"),
-                    "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
-                    "current_streams": current_streams,
-                    "total_items": total_items,
-                    "total_episodes": total_episodes,
-                    "library_stats": library_stats
-                }
+            if self.offline_since is not None:
+                self.offline_since = None
+                self.state_store.delete("emby", "offline_since")
+
+            # Persist summaries (library stats are stored with their own snapshot)
+            self.last_server_info = {
+                key: value for key, value in info.items()
+                if key not in ("library_stats", "downloads", "downloads_today", "uptime_stats")
+            }
+            self.state_store.set("emby", "server_info", self.last_server_info)
+            self.state_store.set("emby", "session_summary", {
+                "sessions": len(sessions),
+                "streams": current_streams,
+                "users": sorted({s.get("UserName") for s in sessions if s.get("NowPlayingItem") and s.get("UserName")}),
+                "updated_at": time.time(),
+            })
+            return info
         except Exception as e:
             self.logger.error(f"Error getting server info: {e}", exc_info=True)
             return {}
@@ -505,123 +566,238 @@ class EmbyCore(commands.Cog):
         
         This method retrieves information about all libraries in the Emby server,
         including counts of movies, series, and episodes. Results are cached to
-        minimize API calls.
+        minimize API calls, and a cache miss triggers a single rescan no matter
+        how many callers are waiting on it.
+
+        The last good snapshot is returned immediately while it is younger than the
+        hard TTL; once it passes the soft TTL a rescan is started in the background.
         """
-        current_time = datetime.now()
-        # Return cached results if within update interval
-        if (
-            self.last_library_update
-            and (current_time - self.last_library_update).total_seconds() <= self.library_update_interval
-        ):
+        age = self.library_cache_age()
+        if age is not None and age <= self.library_hard_ttl:
+            if age > self.library_soft_ttl:
+                self._schedule_library_refresh()
             return self.library_cache
 
+        if age is not None:
+            self.logger.warning(f"Library snapshot is {age:.0f}s old (hard TTL {self.library_hard_ttl:.0f}s), waiting for rescan")
+        return await self._flights.do(("library_stats", self._library_generation), self._refresh_library_stats)
+
+    def invalidate_library_cache(self) -> None:
+        """Drop the library snapshot after a config change, abandoning any rescan that read the old config."""
+        self._library_generation += 1
+        if self._library_refresh_task is not None:
+            self._library_refresh_task.cancel()
+            self._library_refresh_task = None
+        self.library_cache = {}
+        self.last_library_update = None
+
+    def library_cache_age(self) -> Optional[float]:
+        """Seconds since the library snapshot was taken, or None if there is none."""
+        if self.last_library_update is None:
+            return None
+        return (datetime.now() - self.last_library_update).total_seconds()
+
+    def _schedule_library_refresh(self) -> None:
+        """Start a background rescan unless one is already running."""
+        if self._library_refresh_task is None or self._library_refresh_task.done():
+            self.logger.debug("Library snapshot past soft TTL, revalidating in the background")
+            self._library_refresh_task = asyncio.create_task(
+                self._flights.do(("library_stats", self._library_generation), self._refresh_library_stats)
+            )
+
+    async def _refresh_library_stats(self) -> Dict[str, Dict[str, Any]]:
+        current_time = datetime.now()
+        generation = self._library_generation
+
         # Ensure we're authenticated
         if not await self.connect_to_emby():
             self.logger.warning("Using cached library stats due to authentication failure")
             return self.library_cache
 
         try:
-            # Use the stored auth token
-            headers = {
-                "X-Emby-Token": self.auth_token,
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"EmbyWatch\", Device=\"EmbyWatch\", DeviceId=\"embywatch-bot\", Version=\"1.0.0\""
-            }
-        
-            async with aiohttp.ClientSession() as session:
-                # Get all libraries from Emby
-                async with session.get(f"{self.EMBY_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get library folders: HTTP {response.status}")
-                        return self.library_cache
-                    libraries = await response.json()
-                    self.logger.debug(f"Retrieved {len(libraries)} libraries from Emby")
-
-                stats: Dict[str, Dict[str, Any]] = {}
-                emby_config = self.config["emby_sections"]
-                configured_sections = emby_config["sections"]
-
-                for library in libraries:
-                    library_id = library.get("ItemId")
-                    library_name = library.get("Name", "").lower()
+            # Get all libraries from Emby
+            response = await self.emby.get("/Library/VirtualFolders")
+            if response.status != 200:
+                self.logger.error(f"Failed to get library folders: HTTP {response.status}")
+                return self.library_cache
+            libraries = response.data
+            self.logger.debug(f"Retrieved {len(libraries)} libraries from Emby")
+
+            stats: Dict[str, Dict[str, Any]] = {}
+            emby_config = self.config["emby_sections"]
+            configured_sections = emby_config["sections"]
+            semaphore = asyncio.Semaphore(self.library_concurrency)
+            library_ids: List[str] = []
+            fetches = []
+
+            for library in libraries:
+                library_id = library.get("ItemId")
+                library_name = library.get("Name", "").lower()
                     
-                    # Skip libraries that aren't configured if show_all is disabled
-                    if not int(emby_config["show_all"]) and library_id not in configured_sections:
-                        self.logger.debug(f"Skipping library {library_name} (not in configured sections)")
-                        continue
+                # Skip libraries that aren't configured if show_all is disabled
+                if not int(emby_config["show_all"]) and library_id not in configured_sections:
+                    self.logger.debug(f"Skipping library {library_name} (not in configured sections)")
+                    continue
 
-                    # Get library configuration or use defaults
-                    config = configured_sections.get(library_id, {
-                        "display_name": library.get("Name", "Unknown Library"),
-                        "emoji": LIBRARY_EMOJIS.get("default", "📁"),
-                        "show_episodes": 0
-                    })
-
-                    # Get appropriate emoji based on library name
-                    if "emoji" not in config or not config["emoji"]:
-                        config["emoji"] = self._get_library_emoji(library_name)
-
-                    # Use the configured emoji
-                    emoji = config.get("emoji", "📁")
-
-                    # Get item counts for this library
-                    params = {
-                        "ParentId": library_id,
-                        "Recursive": "true",
-                        "IncludeItemTypes": "Movie,Series,Episode",
-                        "Fields": "BasicSyncInfo,MediaSources"
-                    }
-                    async with session.get(
-                        f"{self.EMBY_URL}/Items",
-                        headers=headers,
-                        params=params
-                    ) as items_response:
-                        if items_response.status == 200:
-                            items = await items_response.json()
-                            
-                            # Count items by type
-                            movie_count = sum(1 for item in items["Items"] if item["Type"] == "Movie")
-                            series_count = sum(1 for item in items["Items"] if item["Type"] == "Series")
-                            episode_count = sum(1 for item in items["Items"] if item["Type"] == "Episode")
-                            
-                            self.logger.debug(f"Library {library_name}: {movie_count} movies, {series_count} series, {episode_count} episodes")
-
-                            # Create base stats dictionary
-                            library_stats = {
-                                "count": movie_count + series_count,
-                                "movie_count": movie_count,
-                                "series_count": series_count,
-                                "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
-                                "emoji": emoji,
-                                "show_episodes": int(config.get("show_episodes", 0))  # Ensure integer
-                            }
-
-                            # Only add episodes if show_episodes is 1
-                            if int(config.get("show_episodes", 0)) == 1:
-                                library_stats["episodes"] = episode_count
-
-                            stats[library_id] = library_stats
-                        else:
-                            # Get the response body for more detailed error information
-                            error_body = await items_response.text()
-                            self.logger.error(f"Failed to get items for library {library_name}: HTTP {items_response.status}")
-                            self.logger.error(f"Error response body: {error_body}")
-                            self.logger.error(f"Request URL: {items_response.url}")
-
-                # Update cache and timestamp
-                self.library_cache = stats
-                self.last_library_update = current_time
-                self.logger.info(f"Library stats updated and cached (interval: {self.library_update_interval}s)")
+                # Get library configuration or use defaults
+                config = configured_sections.get(library_id, {
+                    "display_name": library.get("Name", "Unknown Library"),
+                    "emoji": LIBRARY_EMOJIS.get("default", "📁"),
+                    "show_episodes": 0
+                })
+
+                # Get appropriate emoji based on library name
+                if "emoji" not in config or not config["emoji"]:
+                    config["emoji"] = self._get_library_emoji(library_name)
+
+                library_ids.append(library_id)
+                fetches.append(self._fetch_library_stats(library, config, semaphore))
+
+            # Fetch all libraries concurrently; a failed library keeps its previous cached value
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+            for library_id, result in zip(library_ids, results):
+                if isinstance(result, dict):
+                    stats[library_id] = result
+                    continue
+                if isinstance(result, asyncio.TimeoutError):
+                    self.logger.warning(f"Library {library_id} timed out after {self.library_timeout}s")
+                elif isinstance(result, Exception):
+                    self.logger.error(f"Error fetching library {library_id}: {result}")
+                if library_id in self.library_cache:
+                    self.logger.info(f"Keeping cached stats for library {library_id}")
+                    stats[library_id] = self.library_cache[library_id]
+
+            if generation != self._library_generation:
+                self.logger.debug("Library config changed during the rescan, discarding its result")
                 return stats
+
+            # Update cache and timestamp
+            self.library_cache = stats
+            self.last_library_update = current_time
+            self.state_store.set("emby", "library_snapshot", {"stats": stats, "updated_at": current_time.timestamp()})
+            self.logger.info(
+                f"Library stats updated and cached (soft TTL: {self.library_soft_ttl:.0f}s, hard TTL: {self.library_hard_ttl:.0f}s)"
+            )
+            return stats
         except Exception as e:
             self.logger.error(f"Error getting library stats: {e}", exc_info=True)
             return self.library_cache
 
+    async def _fetch_library_stats(
+        self,
+        library: Dict[str, Any],
+        config: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Dict[str, Any]]:
+        """Build the stats entry for one library.
+
+        Runs under ``semaphore`` to bound parallelism; the per-library timeout only
+        starts once a slot is acquired.
+        """
+        library_id = library.get("ItemId")
+        library_name = library.get("Name", "").lower()
+        show_episodes = int(config.get("show_episodes", 0))  # Ensure integer
+
+        async with semaphore:
+            counts = await asyncio.wait_for(
+                self._get_library_counts(library_id, library_name, include_episodes=show_episodes == 1),
+                timeout=self.library_timeout,
+            )
+        if counts is None:
+            return None
+
+        movie_count = counts.get("Movie", 0)
+        series_count = counts.get("Series", 0)
+        self.logger.debug(
+            f"Library {library_name}: {movie_count} movies, {series_count} series, "
+            f"{counts.get('Episode', 'n/a')} episodes"
+        )
+
+        # Create base stats dictionary
+        library_stats = {
+            "count": movie_count + series_count,
+            "movie_count": movie_count,
+            "series_count": series_count,
+            "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
+            "emoji": config.get("emoji", "📁"),
+            "show_episodes": show_episodes
+        }
+
+        # Only add episodes if show_episodes is 1
+        if show_episodes == 1:
+            library_stats["episodes"] = counts.get("Episode", 0)
+
+        return library_stats
+
+    async def _get_library_counts(
+        self,
+        library_id: str,
+        library_name: str,
+        include_episodes: bool,
+    ) -> Optional[Dict[str, int]]:
+        """Get per-type item counts for a library.
+
+        Counts come from zero-item queries so only ``TotalRecordCount`` is transferred.
+        If the server does not report a total, the library is listed in full instead.
+        """
+        item_types = ["Movie", "Series"] + (["Episode"] if include_episodes else [])
+        counts: Dict[str, int] = {}
+        for item_type in item_types:
+            params = {
+                "ParentId": library_id,
+                "Recursive": "true",
+                "IncludeItemTypes": item_type,
+                "Limit": "0",
+                "EnableTotalRecordCount": "true",
+                "EnableImages": "false",
+                "EnableUserData": "false",
+            }
+            response = await self.emby.get("/Items", params=params, endpoint="emby_library")
+            if response.status != 200:
+                self.logger.error(f"Failed to count {item_type} items for library {library_name}: HTTP {response.status}")
+                self.logger.error(f"Error response body: {response.data}")
+                self.logger.error(f"Request URL: {response.url}")
+                return None
+
+            total = response.data.get("TotalRecordCount")
+            if total is None:
+                self.logger.warning(f"No TotalRecordCount for library {library_name}, falling back to full listing")
+                return await self._list_library_counts(library_id, library_name, item_types)
+            counts[item_type] = int(total)
+        return counts
+
+    async def _list_library_counts(
+        self,
+        library_id: str,
+        library_name: str,
+        item_types: List[str],
+    ) -> Optional[Dict[str, int]]:
+        """Count items by type from a full item listing.
+
+        Only used when the server cannot report totals; requests no extra fields.
+        """
+        params = {
+            "ParentId": library_id,
+            "Recursive": "true",
+            "IncludeItemTypes": ",".join(item_types),
+            "EnableImages": "false",
+            "EnableUserData": "false",
+        }
+        response = await self.emby.get("/Items", params=params, endpoint="emby_library")
+        if response.status != 200:
+            self.logger.error(f"Failed to get items for library {library_name}: HTTP {response.status}")
+            self.logger.error(f"Error response body: {response.data}")
+            self.logger.error(f"Request URL: {response.url}")
+            return None
+        items = response.data
+
+        counts = dict.fromkeys(item_types, 0)
+        for item in items.get("Items", []):
+            item_type = item.get("Type")
+            if item_type in counts:
+                counts[item_type] += 1
+        return counts
+
     def _get_library_emoji(self, library_name: str) -> str:
         """Get the appropriate emoji for a library based on its name.
         
@@ -705,10 +881,12 @@ class EmbyCore(commands.Cog):
                 inline=False
             )
             
-            # Set footer with EmbyWatch branding and timestamp
+            # Set footer with EmbyWatch branding, timestamp and snapshot age
             current_time = datetime.now().strftime("%H:%M:%S")
+            age = self.library_cache_age()
+            snapshot_age = f"{int(age // 60)}m {int(age % 60)}s" if age is not None else "n/a"
             embed.set_footer(
-                text=f"Powered by EmbyWatch | {current_time}",
+                text=f"Powered by EmbyWatch | {current_time} | Snapshot age: {snapshot_age}",
                 icon_url=EMBY_LOGO_SMALL
             )
             
@@ -719,9 +897,11 @@ class EmbyCore(commands.Cog):
             await interaction.followup.send(f"❌ Error: {str(e)}", ephemeral=True)
 
     def get_offline_info(self) -> Dict[str, Any]:
-        """Return offline status information."""
+        """Return offline status information, timed from when Emby was first seen down."""
         if self.offline_since is None:
-            self.offline_since = datetime.now()
+            opened_at = self.emby.breaker.opened_at or time.time()
+            self.offline_since = datetime.fromtimestamp(opened_at)
+            self.state_store.set("emby", "offline_since", opened_at)
         
         offline_duration = datetime.now() - self.offline_since
         hours = int(offline_duration.total_seconds() / 3600)
@@ -740,11 +920,12 @@ class EmbyCore(commands.Cog):
                 library_stats[library_id]["episodes"] = int(stats["episodes"])
         
         return {
+            "server_name": self.last_server_info.get("server_name", "Emby Server"),
             "status": "🔴 Offline",
             "uptime": f"Offline for {hours:02d}:{minutes:02d}",
             "library_stats": library_stats,
             "active_users": [],
-            "current_streams": [],
+            "current_streams": 0,
         }
 
     async def create_dashboard_embed(self, info: Dict[str, Any]) -> discord.Embed:
@@ -759,8 +940,8 @@ class EmbyCore(commands.Cog):
         embed.set_thumbnail(url=EMBY_LOGO_LARGE)
         
         # Add server status
-        status = "🟢 Online" if info else "🔴 Offline"
-        uptime = self.calculate_uptime()
+        status = info.get("status", "🟢 Online" if info else "🔴 Offline")
+        uptime = info.get("uptime") or self.calculate_uptime()
         embed.add_field(
             name="Server Status",
             value=f"{status}\nUptime: {uptime}",
@@ -799,6 +980,58 @@ class EmbyCore(commands.Cog):
                     inline=False
                 )
         
+        # Add the download queue when the SABnzbd cog is collecting
+        downloads = info.get("downloads")
+        sabnzbd = self.bot.get_cog("SABnzbd")
+        if downloads and sabnzbd:
+            queue = downloads.get("downloads", [])[:4]
+            entries = [sabnzbd.format_download_info(download, index) for index, download in enumerate(queue)]
+            total_slots = downloads.get("total_slots", len(queue))
+            instances = downloads.get("instances", [])
+            if len(instances) > 1:
+                # One line per SABnzbd server so a dead one stays visible
+                disk_text = "\n".join(
+                    f"🖥️ {instance['name']}: {instance['total_slots']} queued · {instance['speed']} · "
+                    f"💾 {instance['diskspace1']} free"
+                    if instance["online"] else f"🔴 {instance['name']}: unreachable"
+                    for instance in instances
+                )
+            else:
+                disk_text = f"💾 {downloads.get('diskspace1', 'Unknown')} free of {downloads.get('diskspacetotal1', 'Unknown')}"
+            today = info.get("downloads_today")
+            if today:
+                disk_text += f"\n📦 Today: {today['completed']} completed ({today['size']})"
+                if today["failed"]:
+                    disk_text += f", {today['failed']} failed"
+            # Drop whole entries until the field fits; a character cut could land inside a code block
+            while True:
+                queue_lines = list(entries)
+                remaining = total_slots - len(entries)
+                if remaining > 0:
+                    queue_lines.append(f"➕ {remaining} more queued ({downloads.get('sizeleft', 'Unknown')} left)")
+                queue_text = "\n".join(queue_lines)
+                value = f"{queue_text or 'No active downloads'}\n{disk_text}"
+                if len(value) <= 1024 or not entries:
+                    break
+                entries.pop()
+            embed.add_field(
+                name="Downloads",
+                value=value[:1024],
+                inline=False
+            )
+
+        # Add uptime statistics when the Uptime cog is collecting
+        uptime_stats = info.get("uptime_stats")
+        uptime_cog = self.bot.get_cog("Uptime")
+        if uptime_stats and uptime_cog:
+            uptime_text = "\n".join(
+                f"{label}: {uptime_stats[f'uptime_{period}']:.2f}% ({uptime_cog.format_online_time(uptime_stats[f'online_{period}'])})"
+                for period, label in (("24h", "24 Hours"), ("7d", "7 Days"), ("30d", "30 Days"))
+            )
+            if uptime_stats.get("last_offline"):
+                uptime_text += f"\nLast offline: {uptime_stats['last_offline']}"
+            embed.add_field(name="Availability", value=uptime_text, inline=False)
+
         # Set footer with EmbyWatch branding and timestamp
         current_time = datetime.now().strftime("%H:%M:%S")
         # Use footer icon from config if available, otherwise use default
@@ -811,19 +1044,73 @@ class EmbyCore(commands.Cog):
         
         return embed
 
-    async def _update_dashboard_message(self, channel: discord.TextChannel, embed: discord.Embed) -> None:
-        """Update or create the dashboard message."""
+    def get_dashboard_channel(self) -> Optional[discord.TextChannel]:
+        """Return the dashboard channel, resolving it from the bot cache only once."""
+        if self._dashboard_channel is None:
+            self._dashboard_channel = self.bot.get_channel(self.CHANNEL_ID)
+        return self._dashboard_channel
+
+    def _embed_fingerprint(self, embed: discord.Embed) -> str:
+        """Hash the embed content, ignoring the volatile footer timestamp.
+
+        The server status uptime ticks every minute, so it is hashed to the hour
+        only; ``max_staleness`` keeps the minutes shown reasonably current.
+        """
+        data = embed.to_dict()
+        data.pop("footer", None)
+        data.pop("timestamp", None)
+        # to_dict() shares the field dicts with the embed, so normalise copies
+        data["fields"] = [
+            {
+                "name": embed_field.get("name"),
+                "value": UPTIME_MINUTES.sub(r"\1h", embed_field.get("value", ""))
+                if embed_field.get("name") == "Server Status" else embed_field.get("value"),
+                "inline": embed_field.get("inline"),
+            }
+            for embed_field in data.get("fields", [])
+        ]
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    async def _update_dashboard_message(
+        self, channel: discord.TextChannel, embed: discord.Embed, force: bool = False
+    ) -> None:
+        """Update or create the dashboard message.
+
+        The edit is skipped when the embed matches the last published one, unless
+        ``force`` is set or the message is older than ``dashboard.max_staleness``.
+        """
         try:
             if not channel:
                 self.logger.error("Dashboard channel not found")
                 return
 
+            fingerprint = self._embed_fingerprint(embed)
+            if (
+                not force
+                and self.dashboard_message_id
+                and fingerprint == self._dashboard_fingerprint
+                and self._dashboard_published_at is not None
+                and time.monotonic() - self._dashboard_published_at < self.dashboard_max_staleness
+            ):
+                self.logger.debug("Dashboard content unchanged, skipping edit")
+                return
+
             if self.dashboard_message_id:
                 try:
-                    message = await channel.fetch_message(self.dashboard_message_id)
-                    await message.edit(embed=embed)
+                    # Edit through a partial message; no fetch is needed just to call .edit
+                    await channel.get_partial_message(self.dashboard_message_id).edit(embed=embed)
+                    self._dashboard_fingerprint = fingerprint
+                    self._dashboard_published_at = time.monotonic()
                     return
-                except discord.NotFound:
+                except discord.NotFound as e:
+                    if e.code == 10003:  # Unknown Channel: drop the cached channel
+                        self._dashboard_channel = None
+                        self.logger.error("Dashboard channel no longer exists")
+                        return
+                    if await self._recover_dashboard_message(channel, embed):
+                        self._dashboard_fingerprint = fingerprint
+                        self._dashboard_published_at = time.monotonic()
+                        return
                     self.dashboard_message_id = None
                 except discord.Forbidden:
                     self.logger.error("Bot doesn't have permission to edit messages in the channel")
@@ -832,9 +1119,21 @@ class EmbyCore(commands.Cog):
             message = await channel.send(embed=embed)
             self.dashboard_message_id = message.id
             self._save_message_id(message.id)
+            self._dashboard_fingerprint = fingerprint
+            self._dashboard_published_at = time.monotonic()
         except Exception as e:
             self.logger.error(f"Error updating dashboard message: {e}")
 
+    async def _recover_dashboard_message(self, channel: discord.TextChannel, embed: discord.Embed) -> bool:
+        """Fetch the dashboard message after a failed edit and retry once if it still exists."""
+        try:
+            message = await channel.fetch_message(self.dashboard_message_id)
+        except discord.NotFound:
+            self.logger.info("Dashboard message was deleted, sending a new one")
+            return False
+        await message.edit(embed=embed)
+        return True
+
     @app_commands.command(name="update_libraries", description="Update Emby library sections in the dashboard")
     @app_commands.check(is_authorized)
     async def update_libraries(self, interaction: discord.Interaction):
@@ -847,23 +1146,12 @@ class EmbyCore(commands.Cog):
                 return
 
             # Get all libraries
-            headers = {
-                "X-Emby-Token": self.EMBY_API_KEY,
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"EmbyWatch\", Device=\"EmbyWatch\", DeviceId=\"embywatch-bot\", Version=\"1.0.0\""
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.EMBY_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        await interaction.followup.send("❌ Failed to fetch libraries from Emby.", ephemeral=True)
-                        return
+            response = await self.emby.get("/Library/VirtualFolders")
+            if response.status != 200:
+                await interaction.followup.send("❌ Failed to fetch libraries from Emby.", ephemeral=True)
+                return
 
-                    libraries = await response.json()
+            libraries = response.data
             
             # Sort libraries by name
             libraries = sorted(libraries, key=lambda x: x.get("Name", "").lower())
@@ -926,11 +1214,9 @@ class EmbyCore(commands.Cog):
             # Wait 10 seconds
             await asyncio.sleep(10)
             
-            # Get server info and update dashboard
-            info = await self.get_server_info()
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
+            # Collect a fresh snapshot and republish the dashboard
+            self.invalidate_library_cache()
+            await self.run_forced_cycle()
             
         except Exception as e:
             self.logger.error(f"Error updating libraries: {e}")
@@ -970,14 +1256,10 @@ class EmbyCore(commands.Cog):
             self.save_config()
             
             # Clear the library cache and force a refresh
-            self.library_cache = {}
-            self.last_library_update = None
+            self.invalidate_library_cache()
             
-            # Get server info and update dashboard
-            info = await self.get_server_info()
-            channel = self.bot.get_channel(self.CHANNEL_ID)
-            embed = await self.create_dashboard_embed(info)
-            await self._update_dashboard_message(channel, embed)
+            # Collect a fresh snapshot and republish the dashboard
+            await self.run_forced_cycle()
             
             await interaction.followup.send(
                 f"✅ Episode numbers display has been {'enabled' if new_state == 1 else 'disabled'}!",
@@ -997,28 +1279,20 @@ class EmbyCore(commands.Cog):
         try:
             self.logger.info("Starting dashboard refresh...")
             
-            # Get server info and update dashboard
-            self.logger.info("Attempting to get server info...")
-            info = await self.get_server_info()
-            if not info:
-                self.logger.error("Failed to get server info - empty response")
-                await interaction.followup.send("❌ Failed to get server information. Check bot logs for details.", ephemeral=True)
-                return
-                
-            self.logger.info(f"Got server info: {info.get('server_name', 'Unknown Server')}")
-            
             self.logger.info(f"Getting channel with ID: {self.CHANNEL_ID}")
-            channel = self.bot.get_channel(self.CHANNEL_ID)
+            channel = self.get_dashboard_channel()
             if not channel:
                 self.logger.error(f"Channel {self.CHANNEL_ID} not found")
                 await interaction.followup.send("❌ Dashboard channel not found. Check CHANNEL_ID in config.", ephemeral=True)
                 return
-                
-            self.logger.info("Creating dashboard embed...")
-            embed = await self.create_dashboard_embed(info)
-            
-            self.logger.info("Updating dashboard message...")
-            await self._update_dashboard_message(channel, embed)
+
+            # Collect a fresh snapshot; the dashboard consumer republishes it
+            self.logger.info("Running a collection cycle...")
+            snapshot = await self.run_forced_cycle()
+            if not snapshot.ok("emby_system_info"):
+                self.logger.error(f"Failed to get server info: {snapshot.errors.get('emby_system_info')}")
+                await interaction.followup.send("❌ Failed to get server information. Check bot logs for details.", ephemeral=True)
+                return
             
             self.logger.info("Dashboard refresh completed successfully")
             await interaction.followup.send("✅ Dashboard refreshed successfully!", ephemeral=True)
@@ -1041,35 +1315,35 @@ class EmbyCore(commands.Cog):
             
             if connection_successful:
                 # Get basic server info
-                headers = {
-                    "X-Emby-Token": self.auth_token,
-                    "X-Emby-Client": "EmbyWatch",
-                    "X-Emby-Client-Version": "1.0.0",
-                    "X-Emby-Device-Name": "EmbyWatch",
-                    "X-Emby-Device-Id": "embywatch-bot",
-                    "Accept": "application/json",
-                    "Content-Type": "application/json"
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{self.EMBY_URL}/System/Info", headers=headers) as response:
-                        if response.status == 200:
-                            system_info = await response.json()
-                            embed = discord.Embed(
-                                title="✅ Emby Server Connection Test",
-                                description=f"Successfully connected to Emby server",
-                                color=discord.Color.green()
-                            )
-                            embed.add_field(name="Server Name", value=system_info.get("ServerName", "Unknown"), inline=True)
-                            embed.add_field(name="Version", value=system_info.get("Version", "Unknown"), inline=True)
-                            embed.add_field(name="Operating System", value=system_info.get("OperatingSystem", "Unknown"), inline=True)
-                            embed.add_field(name="Response Time", value=f"{response_time}ms", inline=True)
-                            embed.add_field(name="Auth Method", value="API Key" if self.auth_token == self.EMBY_API_KEY else "User Credentials", inline=True)
-                            embed.set_footer(text=f"Emby URL: {self.EMBY_URL}")
-                            
-                            await interaction.followup.send(embed=embed, ephemeral=True)
-                            self.logger.info(f"Connection test successful - Server: {system_info.get('ServerName')}")
-                            return
+                response = await self.emby.get("/System/Info")
+                if response.status == 200:
+                    system_info = response.data
+                    embed = discord.Embed(
+                        title="✅ Emby Server Connection Test",
+                        description=f"Successfully connected to Emby server",
+                        color=discord.Color.green()
+                    )
+                    embed.add_field(name="Server Name", value=system_info.get("ServerName", "Unknown"), inline=True)
+                    embed.add_field(name="Version", value=system_info.get("Version", "Unknown"), inline=True)
+                    embed.add_field(name="Operating System", value=system_info.get("OperatingSystem", "Unknown"), inline=True)
+                    embed.add_field(name="Response Time", value=f"{response_time}ms", inline=True)
+                    embed.add_field(name="Auth Method", value="API Key" if self.emby.auth_method == "api_key" else "User Credentials", inline=True)
+                    embed.add_field(
+                        name="Poll Interval",
+                        value=f"{self.poll_interval.current:.0f}s",
+                        inline=True
+                    )
+                    presence_stats = self.presence.stats()
+                    embed.add_field(
+                        name="Presence Updates",
+                        value=f"{presence_stats['sent']} sent / {presence_stats['suppressed']} suppressed",
+                        inline=True
+                    )
+                    embed.set_footer(text=f"Emby URL: {self.EMBY_URL}")
+                        
+                    await interaction.followup.send(embed=embed, ephemeral=True)
+                    self.logger.info(f"Connection test successful - Server: {system_info.get('ServerName')}")
+                    return
                 
                 # Basic success response if we couldn't get system info
                 await interaction.followup.send(f"✅ Successfully connected to Emby server at {self.EMBY_URL} (Response time: {response_time}ms)", ephemeral=True)
@@ -1081,6 +1355,8 @@ class EmbyCore(commands.Cog):
                 )
                 embed.add_field(name="Possible Issues", value="• Incorrect server URL\n• Invalid API key\n• Invalid username/password\n• Server is offline\n• Network connectivity issues", inline=False)
                 embed.add_field(name="Response Time", value=f"{response_time}ms", inline=True)
+                if self.emby.breaker.is_open:
+                    embed.add_field(name="Next Probe", value=f"in {self.emby.breaker.retry_in():.0f}s", inline=True)
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 self.logger.error(f"Connection test failed - URL: {self.EMBY_URL}")
@@ -1128,8 +1404,9 @@ class EmbyCore(commands.Cog):
     def save_config(self) -> None:
         """Save the current configuration to config.json."""
         try:
-            # Create a copy of the config to modify
+            # Create a copy of the config to modify, keeping sections owned by other cogs
             config_to_save = {
+                **self.config,
                 "dashboard": self.config.get("dashboard", {}),
                 "emby_sections": {
                     "show_all": int(self.config.get("emby_sections", {}).get("show_all", 1)),
@@ -1155,36 +1432,45 @@ class EmbyCore(commands.Cog):
             raise
 
     async def get_sessions(self) -> List[Dict[str, Any]]:
-        """Get current Emby sessions."""
+        """Get current Emby sessions, or an empty list if they cannot be fetched."""
+        sessions = await self._fetch_sessions()
+        return sessions if sessions is not None else []
+
+    async def _fetch_sessions(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch current Emby sessions, returning None on failure.
+
+        Served from the websocket session table while it is live; otherwise, and
+        whenever a reconciliation is due, ``/Sessions`` is polled.
+        """
+        tracker = self.session_tracker
+        if tracker and tracker.is_live and not tracker.needs_reconcile():
+            self.last_sessions = tracker.sessions
+            return self.last_sessions
+
         if not await self.connect_to_emby():
-            return []
+            return None
 
         try:
-            headers = {
-                "X-Emby-Token": self.EMBY_API_KEY,
-                "X-Emby-Client": "EmbyWatch",
-                "X-Emby-Client-Version": "1.0.0",
-                "X-Emby-Device-Name": "EmbyWatch",
-                "X-Emby-Device-Id": "embywatch-bot",
-                "Accept": "application/json",
-                "X-Emby-Authorization": "MediaBrowser Client=\"EmbyWatch\", Device=\"EmbyWatch\", DeviceId=\"embywatch-bot\", Version=\"1.0.0\""
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.EMBY_URL}/Sessions", headers=headers) as response:
-                    if response.status == 200:
-                        sessions = await response.json()
-                        self.logger.debug(f"Retrieved {len(sessions)} session items from Emby.")
-                        return sessions
-                    elif response.status == 401:
-                        self.logger.error("Invalid API key when fetching sessions")
-                        return []
-                    else:
-                        self.logger.error(f"Failed to get sessions: HTTP {response.status}")
-                        return []
+            response = await self.emby.get("/Sessions")
+            if response.status == 200:
+                sessions = response.data
+                if not isinstance(sessions, list):
+                    self.logger.error(f"Sessions endpoint did not return a list: {type(sessions)}")
+                    return None
+                self.logger.debug(f"Retrieved {len(sessions)} session items from Emby.")
+                if tracker:
+                    tracker.reconcile(sessions)
+                self.last_sessions = sessions
+                return sessions
+            elif response.status == 401:
+                self.logger.error("Emby rejected credentials when fetching sessions")
+                return None
+            else:
+                self.logger.error(f"Failed to get sessions: HTTP {response.status}")
+                return None
         except Exception as e:
             self.logger.error(f"Error getting sessions: {e}")
-            return []
+            return None
 
     # Duplicate test-libraries command removed from here
 
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from discord import app_commands
-from main import is_authorized
+from auth import is_authorized
 import asyncio
 import aiohttp
 
@@ -160,6 +160,7 @@ if not RUNNING_IN_DOCKER:
 class JellyfinCore(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.http_service = bot.http_service  # Shared pooled HTTP transport
         self.logger = logging.getLogger("jellywatch_bot.jellyfin")
 
         # Load environment variables
@@ -191,11 +192,22 @@ class JellyfinCore(commands.Cog):
         self.library_cache: Dict[str, Dict[str, Any]] = {}
         self.last_library_update: Optional[datetime] = None
         self.library_update_interval = self.config.get("cache", {}).get("library_update_interval", 900)
+        self.library_concurrency = max(1, int(self.config.get("cache", {}).get("library_concurrency", 4)))
+        # Never cut a library scan shorter than the jellyfin_library timeout class it already runs under
+        self.library_timeout = max(
+            float(self.config.get("cache", {}).get("library_timeout", 0)),
+            self.http_service.timeout("jellyfin_library").total or 0,
+        )
 
         self.user_mapping = self._load_user_mapping()
         self.update_status.start()
         self.update_dashboard.start()
 
+    def cog_unload(self) -> None:
+        """Stop background loops; the shared HTTP pool is owned by the bot."""
+        self.update_status.cancel()
+        self.update_dashboard.cancel()
+
     def _format_size(self, size_bytes: int) -> str:
         """Convert bytes to a human-readable format."""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -214,7 +226,7 @@ class JellyfinCore(commands.Cog):
                 "offline_text": "🔴 Server Offline!",
                 "stream_text": "{count} active Stream{s} 🟢",
             },
-            "cache": {"library_update_interval": 900},
+            "cache": {"library_update_interval": 900, "library_concurrency": 4},
         }
         try:
             with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
@@ -277,18 +289,20 @@ class JellyfinCore(commands.Cog):
             # First try with API key if available
             if self.JELLYFIN_API_KEY:
                 headers["X-Emby-Token"] = self.JELLYFIN_API_KEY
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{self.JELLYFIN_URL}/System/Info", headers=headers) as response:
-                        if response.status == 200:
-                            if self.jellyfin_start_time is None:
-                                self.jellyfin_start_time = time.time()
-                            return True
-                        elif response.status == 401:
-                            self.logger.error("Invalid API key provided")
-                            return False
-                        else:
-                            self.logger.error(f"Failed to connect with API key: HTTP {response.status}")
-                            return False
+                session = self.http_service.session
+                async with session.get(
+                    f"{self.JELLYFIN_URL}/System/Info", headers=headers, timeout=self.http_service.timeout("jellyfin")
+                ) as response:
+                    if response.status == 200:
+                        if self.jellyfin_start_time is None:
+                            self.jellyfin_start_time = time.time()
+                        return True
+                    elif response.status == 401:
+                        self.logger.error("Invalid API key provided")
+                        return False
+                    else:
+                        self.logger.error(f"Failed to connect with API key: HTTP {response.status}")
+                        return False
 
             # If API key fails or not available, try username/password
             if self.JELLYFIN_USERNAME and self.JELLYFIN_PASSWORD:
@@ -296,22 +310,23 @@ class JellyfinCore(commands.Cog):
                     "Username": self.JELLYFIN_USERNAME,
                     "Pw": self.JELLYFIN_PASSWORD
                 }
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.JELLYFIN_URL}/Users/AuthenticateByName",
-                        json=auth_data,
-                        headers=headers
-                    ) as response:
-                        if response.status == 200:
-                            if self.jellyfin_start_time is None:
-                                self.jellyfin_start_time = time.time()
-                            return True
-                        elif response.status == 401:
-                            self.logger.error("Invalid username or password")
-                            return False
-                        else:
-                            self.logger.error(f"Failed to authenticate with username/password: HTTP {response.status}")
-                            return False
+                session = self.http_service.session
+                async with session.post(
+                    f"{self.JELLYFIN_URL}/Users/AuthenticateByName",
+                    json=auth_data,
+                    headers=headers,
+                    timeout=self.http_service.timeout("jellyfin")
+                ) as response:
+                    if response.status == 200:
+                        if self.jellyfin_start_time is None:
+                            self.jellyfin_start_time = time.time()
+                        return True
+                    elif response.status == 401:
+                        self.logger.error("Invalid username or password")
+                        return False
+                    else:
+                        self.logger.error(f"Failed to authenticate with username/password: HTTP {response.status}")
+                        return False
 
             self.logger.error("No authentication method provided (API key or username/password required)")
             return False
@@ -368,32 +383,34 @@ class JellyfinCore(commands.Cog):
                 "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
             }
 
-            async with aiohttp.ClientSession() as session:
-                # Get system info
-                async with session.get(f"{self.JELLYFIN_URL}/System/Info", headers=headers) as response:
-                    if response.status != 200:
-                        return {}
-                    system_info = await response.json()
+            session = self.http_service.session
+            # Get system info
+            async with session.get(
+                f"{self.JELLYFIN_URL}/System/Info", headers=headers, timeout=self.http_service.timeout("jellyfin")
+            ) as response:
+                if response.status != 200:
+                    return {}
+                system_info = await response.json()
                 
-                # Get sessions
-                sessions = await self.get_sessions()
-                current_streams = len([s for s in sessions if s.get("NowPlayingItem")]) if sessions else 0
-
-                # Get library stats
-                library_stats = await self.get_library_stats()
-                total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
-                total_episodes = sum(int(episodes) for stats in library_stats.values() 
-                                   if (episodes := stats.get("episodes")) is not None)
-
-                return {
-                    "server_name": system_info.get("ServerName", "Unknown Server"),
-                    "version": system_info.get("Version", "Unknown Version"),
-                    "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
-                    "current_streams": current_streams,
-                    "total_items": total_items,
-                    "total_episodes": total_episodes,
-                    "library_stats": library_stats
-                }
+            # Get sessions
+            sessions = await self.get_sessions()
+            current_streams = len([s for s in sessions if s.get("NowPlayingItem")]) if sessions else 0
+
+            # Get library stats
+            library_stats = await self.get_library_stats()
+            total_items = sum(int(stats.get("count", 0)) for stats in library_stats.values())
+            total_episodes = sum(int(episodes) for stats in library_stats.values() 
+                               if (episodes := stats.get("episodes")) is not None)
+
+            return {
+                "server_name": system_info.get("ServerName", "Unknown Server"),
+                "version": system_info.get("Version", "Unknown Version"),
+                "operating_system": system_info.get("OperatingSystem", "Unknown OS"),
+                "current_streams": current_streams,
+                "total_items": total_items,
+                "total_episodes": total_episodes,
+                "library_stats": library_stats
+            }
         except Exception as e:
             self.logger.error(f"Error getting server info: {e}")
             return {}
@@ -430,74 +447,51 @@ class JellyfinCore(commands.Cog):
                 "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
             }
             
-            async with aiohttp.ClientSession() as session:
-                # Get all libraries
-                async with session.get(f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get library folders: HTTP {response.status}")
-                        return self.library_cache
-                    libraries = await response.json()
-
-                stats: Dict[str, Dict[str, Any]] = {}
-                jellyfin_config = self.config["jellyfin_sections"]
-                configured_sections = jellyfin_config["sections"]
-
-                for library in libraries:
-                    library_id = library.get("ItemId")
-                    library_name = library.get("Name", "").lower()
+            session = self.http_service.session
+            # Get all libraries
+            async with session.get(
+                f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers, timeout=self.http_service.timeout("jellyfin")
+            ) as response:
+                if response.status != 200:
+                    self.logger.error(f"Failed to get library folders: HTTP {response.status}")
+                    return self.library_cache
+                libraries = await response.json()
+
+            stats: Dict[str, Dict[str, Any]] = {}
+            jellyfin_config = self.config["jellyfin_sections"]
+            configured_sections = jellyfin_config["sections"]
+            semaphore = asyncio.Semaphore(self.library_concurrency)
+            library_ids: List[str] = []
+            fetches = []
+
+            for library in libraries:
+                library_id = library.get("ItemId")
                     
-                    if not int(jellyfin_config["show_all"]) and library_id not in configured_sections:
-                        continue
+                if not int(jellyfin_config["show_all"]) and library_id not in configured_sections:
+                    continue
 
-                    # Get library configuration
-                    config = configured_sections.get(library_id, {
-                        "display_name": library.get("Name", "Unknown Library"),
-                        "emoji": LIBRARY_EMOJIS["default"],
-                        "show_episodes": 0
-                    })
-
-                    # Use the configured emoji directly
-                    emoji = config.get("emoji", LIBRARY_EMOJIS["default"])
-
-                    # Get item counts
-                    params = {
-                        "ParentId": library_id,
-                        "Recursive": "true",
-                        "IncludeItemTypes": "Movie,Series,Episode",
-                        "Fields": "BasicSyncInfo,MediaSources"
-                    }
-                    async with session.get(
-                        f"{self.JELLYFIN_URL}/Items",
-                        headers=headers,
-                        params=params
-                    ) as items_response:
-                        if items_response.status == 200:
-                            items = await items_response.json()
-                            movie_count = sum(1 for item in items["Items"] if item["Type"] == "Movie")
-                            series_count = sum(1 for item in items["Items"] if item["Type"] == "Series")
-                            episode_count = sum(1 for item in items["Items"] if item["Type"] == "Episode")
-
-                            # Create base stats dictionary
-                            library_stats = {
-                                "count": movie_count + series_count,
-                                "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
-                                "emoji": emoji,
-                                "show_episodes": int(config.get("show_episodes", 0))  # Ensure integer
-                            }
-
-                            # Only add episodes if show_episodes is 1
-                            if int(config.get("show_episodes", 0)) == 1:
-                                library_stats["episodes"] = episode_count
-
-                            stats[library_id] = library_stats
-                        else:
-                            # Get the response body for more detailed error information
-                            error_body = await items_response.text()
-                            self.logger.error(f"Failed to get items for library {library_name}: HTTP {items_response.status}")
-                            self.logger.error(f"Error response body: {error_body}")
-                            self.logger.error(f"Request URL: {items_response.url}")
-                            self.logger.error(f"Request headers: {headers}")
-                            self.logger.error(f"Request params: {params}")
+                # Get library configuration
+                config = configured_sections.get(library_id, {
+                    "display_name": library.get("Name", "Unknown Library"),
+                    "emoji": LIBRARY_EMOJIS["default"],
+                    "show_episodes": 0
+                })
+
+                library_ids.append(library_id)
+                fetches.append(self._fetch_library_stats(session, headers, library, config, semaphore))
+
+            # Fetch all libraries concurrently; a failed library keeps its previous cached value
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+            for library_id, result in zip(library_ids, results):
+                if isinstance(result, dict):
+                    stats[library_id] = result
+                    continue
+                if isinstance(result, asyncio.TimeoutError):
+                    self.logger.warning(f"Library {library_id} timed out after {self.library_timeout}s")
+                elif isinstance(result, Exception):
+                    self.logger.error(f"Error fetching library {library_id}: {result}")
+                if library_id in self.library_cache:
+                    stats[library_id] = self.library_cache[library_id]
 
             self.library_cache = stats
             self.last_library_update = current_time
@@ -507,6 +501,77 @@ class JellyfinCore(commands.Cog):
             self.logger.error(f"Error updating library stats: {e}")
             return self.library_cache
 
+    async def _fetch_library_stats(
+        self,
+        session: aiohttp.ClientSession,
+        headers: Dict[str, str],
+        library: Dict[str, Any],
+        config: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Dict[str, Any]]:
+        """Build the stats entry for one library under the shared concurrency limit."""
+        library_id = library.get("ItemId")
+        library_name = library.get("Name", "").lower()
+
+        # Use the configured emoji directly
+        emoji = config.get("emoji", LIBRARY_EMOJIS["default"])
+
+        async with semaphore:
+            items = await asyncio.wait_for(
+                self._get_library_items(session, headers, library_id, library_name),
+                timeout=self.library_timeout,
+            )
+        if items is None:
+            return None
+
+        movie_count = sum(1 for item in items["Items"] if item["Type"] == "Movie")
+        series_count = sum(1 for item in items["Items"] if item["Type"] == "Series")
+        episode_count = sum(1 for item in items["Items"] if item["Type"] == "Episode")
+
+        # Create base stats dictionary
+        library_stats = {
+            "count": movie_count + series_count,
+            "display_name": config.get("display_name", library.get("Name", "Unknown Library")),
+            "emoji": emoji,
+            "show_episodes": int(config.get("show_episodes", 0))  # Ensure integer
+        }
+
+        # Only add episodes if show_episodes is 1
+        if int(config.get("show_episodes", 0)) == 1:
+            library_stats["episodes"] = episode_count
+
+        return library_stats
+
+    async def _get_library_items(
+        self,
+        session: aiohttp.ClientSession,
+        headers: Dict[str, str],
+        library_id: str,
+        library_name: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch the item listing for one library."""
+        params = {
+            "ParentId": library_id,
+            "Recursive": "true",
+            "IncludeItemTypes": "Movie,Series,Episode",
+            "Fields": "BasicSyncInfo,MediaSources"
+        }
+        async with session.get(
+            f"{self.JELLYFIN_URL}/Items",
+            headers=headers,
+            params=params,
+            timeout=self.http_service.timeout("jellyfin_library")
+        ) as items_response:
+            if items_response.status != 200:
+                # Get the response body for more detailed error information
+                error_body = await items_response.text()
+                self.logger.error(f"Failed to get items for library {library_name}: HTTP {items_response.status}")
+                self.logger.error(f"Error response body: {error_body}")
+                self.logger.error(f"Request URL: {items_response.url}")
+                self.logger.error(f"Request params: {params}")
+                return None
+            return await items_response.json()
+
     async def get_sessions(self) -> List[Dict[str, Any]]:
         """Get current Jellyfin sessions."""
         if not await self.connect_to_jellyfin():
@@ -523,16 +588,18 @@ class JellyfinCore(commands.Cog):
                 "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.JELLYFIN_URL}/Sessions", headers=headers) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 401:
-                        self.logger.error("Invalid API key when fetching sessions")
-                        return []
-                    else:
-                        self.logger.error(f"Failed to get sessions: HTTP {response.status}")
-                        return []
+            session = self.http_service.session
+            async with session.get(
+                f"{self.JELLYFIN_URL}/Sessions", headers=headers, timeout=self.http_service.timeout("jellyfin")
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                elif response.status == 401:
+                    self.logger.error("Invalid API key when fetching sessions")
+                    return []
+                else:
+                    self.logger.error(f"Failed to get sessions: HTTP {response.status}")
+                    return []
         except Exception as e:
             self.logger.error(f"Error getting sessions: {e}")
             return []
@@ -739,13 +806,15 @@ class JellyfinCore(commands.Cog):
                 "X-Emby-Authorization": "MediaBrowser Client=\"JellyWatch\", Device=\"JellyWatch\", DeviceId=\"jellywatch-bot\", Version=\"1.0.0\""
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers) as response:
-                    if response.status != 200:
-                        await interaction.followup.send("❌ Failed to fetch libraries from Jellyfin.", ephemeral=True)
-                        return
+            session = self.http_service.session
+            async with session.get(
+                f"{self.JELLYFIN_URL}/Library/VirtualFolders", headers=headers, timeout=self.http_service.timeout("jellyfin")
+            ) as response:
+                if response.status != 200:
+                    await interaction.followup.send("❌ Failed to fetch libraries from Jellyfin.", ephemeral=True)
+                    return
 
-                    libraries = await response.json()
+                libraries = await response.json()
             
             # Sort libraries by name
             libraries = sorted(libraries, key=lambda x: x.get("Name", "").lower())
@@ -949,8 +1018,9 @@ class JellyfinCore(commands.Cog):
     def save_config(self) -> None:
         """Save the current configuration to config.json."""
         try:
-            # Create a copy of the config to modify
+            # Create a copy of the config to modify, keeping sections owned by other cogs
             config_to_save = {
+                **self.config,
                 "dashboard": self.config.get("dashboard", {}),
                 "jellyfin_sections": {
                     "show_all": int(self.config.get("jellyfin_sections", {}).get("show_all", 1)),
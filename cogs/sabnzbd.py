@@ -1,20 +1,87 @@
+import discord
 from discord.ext import commands
+from discord import app_commands
 import aiohttp
+import asyncio
+import io
 import logging
+import math
 import os
 import json
-from typing import Dict, Any, List
+import re
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any, List, Optional, Pattern, Tuple
 from dotenv import load_dotenv
 from urllib.parse import urljoin
+from auth import is_authorized
 
 RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 
 if not RUNNING_IN_DOCKER:
     load_dotenv()
 
+class SpeedRing:
+    """Fixed-size ring of speed samples with an exponentially smoothed rate.
+
+    Samples go into preallocated arrays, so memory stays the same however long
+    the bot runs. Smoothing is weighted by the time between samples, as polls
+    are not evenly spaced; ``tau`` is how many seconds a change takes to carry
+    about two thirds of its weight.
+    """
+
+    def __init__(self, size: int = 30, tau: float = 60.0) -> None:
+        self.size = max(1, size)
+        self.tau = max(1.0, tau)
+        self.speeds = array("d", [0.0]) * self.size
+        self.times = array("d", [0.0]) * self.size
+        self.head = 0
+        self.count = 0
+        self.smoothed: Optional[float] = None
+        self._sum = 0.0
+
+    def add(self, kbps: float, at: float) -> float:
+        """Record a sample and return the updated smoothed speed in KB/s."""
+        if self.count:
+            last = self.times[(self.head - 1) % self.size]
+            weight = 1 - math.exp(-max(0.0, at - last) / self.tau)
+            self.smoothed += weight * (kbps - self.smoothed)
+        else:
+            self.smoothed = kbps
+        if self.count == self.size:
+            self._sum -= self.speeds[self.head]
+        else:
+            self.count += 1
+        self.speeds[self.head] = kbps
+        self.times[self.head] = at
+        self._sum += kbps
+        self.head = (self.head + 1) % self.size
+        return self.smoothed
+
+    @property
+    def average(self) -> float:
+        """Plain mean of the samples in the ring."""
+        return self._sum / self.count if self.count else 0.0
+
+@dataclass
+class SABInstance:
+    """One SABnzbd server and the history state tailed from it."""
+
+    name: str
+    url: str
+    api_key: str
+    timeout: float = 8.0
+    history: List[Dict[str, Any]] = field(default_factory=list)
+    history_watermark: Dict[str, Any] = field(default_factory=lambda: {"completed": 0, "nzo_ids": []})
+    speed: SpeedRing = field(default_factory=SpeedRing)
+
 class SABnzbd(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.http_service = bot.http_service  # Shared pooled HTTP transport
+        self.state_store = bot.state_store
         self.logger = logging.getLogger("jellywatch_bot.sabnzbd")
         self.SABNZBD_URL = os.getenv("SABNZBD_URL")
         self.SABNZBD_API_KEY = os.getenv("SABNZBD_API_KEY")
@@ -22,62 +89,374 @@ class SABnzbd(commands.Cog):
         # Path to config.json
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.CONFIG_FILE = os.path.join(self.current_dir, "..", "data", "config.json")
+        self.sab_config = self._load_sab_config()
         self.keywords = self._load_keywords()
+        self._keyword_pattern = self._compile_keywords(self.keywords)
+        self._trimmed_names: Dict[str, Tuple[str, str]] = {}  # nzo_id -> (raw name, trimmed name)
+        # Only the slots the dashboard renders are requested; the full queue is paged on demand
+        self.queue_limit = max(1, int(self.sab_config.get("queue_limit", 4)))
+        self.page_size = max(1, int(self.sab_config.get("page_size", 100)))
 
-    def _load_keywords(self) -> List[str]:
-        """Load SABnzbd keywords from config.json with defaults if unavailable."""
-        default_keywords = ["AC3", "DL", "German", "1080p", "2160p", "4K", "GERMAN"]
+        # Finished downloads are tailed from SAB's history and kept locally past a watermark
+        self.history_page_size = max(1, int(self.sab_config.get("history_page_size", 20)))
+        self.history_retention = float(self.sab_config.get("history_retention_days", 7)) * 86400
+
+        # SAB's instantaneous speed jumps around; ETAs come from a smoothed rate instead
+        self.speed_samples = max(1, int(self.sab_config.get("speed_samples", 30)))
+        self.speed_smoothing = float(self.sab_config.get("speed_smoothing", 60))
+
+        self.instances = self._load_instances()
+
+        # Queue and history are fetched as part of the shared collection cycle
+        if self.instances:
+            bot.poll_scheduler.add_collector("sabnzbd", self.fetch_queue, deadline=10)
+            bot.poll_scheduler.add_collector(
+                "sabnzbd_history", self.collect_history, deadline=10,
+                every=float(self.sab_config.get("history_interval", 60)),
+            )
+
+    def cog_unload(self) -> None:
+        """Stop contributing to the collection cycle."""
+        self.bot.poll_scheduler.remove_collector("sabnzbd")
+        self.bot.poll_scheduler.remove_collector("sabnzbd_history")
+
+    def _load_sab_config(self) -> Dict[str, Any]:
+        """Load the sabnzbd section of config.json, empty if unavailable."""
         try:
             with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                return config.get("sabnzbd", {}).get("keywords", default_keywords)
+                return json.load(f).get("sabnzbd", {})
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            self.logger.error(f"Failed to load SABnzbd keywords: {e}. Using defaults.")
-            return default_keywords
+            self.logger.error(f"Failed to load SABnzbd config: {e}. Using defaults.")
+            return {}
+
+    def _load_keywords(self) -> List[str]:
+        """Load SABnzbd keywords from config.json with defaults if unavailable."""
+        default_keywords = ["AC3", "DL", "German", "1080p", "2160p", "4K", "GERMAN"]
+        return self.sab_config.get("keywords", default_keywords)
+
+    def _load_instances(self) -> List[SABInstance]:
+        """Build instances from ``sabnzbd.instances``, or from the .env settings if none are listed.
+
+        Each entry needs a ``url`` and either an ``api_key`` or the name of an
+        environment variable holding it in ``api_key_env``.
+        """
+        default_timeout = float(self.sab_config.get("instance_timeout", 8))
+        instances: List[SABInstance] = []
+        for entry in self.sab_config.get("instances", []):
+            url = entry.get("url")
+            api_key = entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), "")
+            if not url or not api_key:
+                self.logger.warning(f"Skipping SABnzbd instance without url or API key: {entry.get('name', url)}")
+                continue
+            name = entry.get("name") or url
+            instances.append(SABInstance(name, url, api_key, float(entry.get("timeout", default_timeout))))
+        if not instances and self.SABNZBD_URL and self.SABNZBD_API_KEY:
+            instances.append(SABInstance("SABnzbd", self.SABNZBD_URL, self.SABNZBD_API_KEY, default_timeout))
+
+        for instance in instances:
+            instance.speed = SpeedRing(self.speed_samples, self.speed_smoothing)
+            # A lone instance also picks up history stored before instances were named
+            legacy = len(instances) == 1
+            instance.history = self.state_store.get(
+                "sabnzbd", f"history:{instance.name}", self.state_store.get("sabnzbd", "history", []) if legacy else []
+            )
+            instance.history_watermark = self.state_store.get(
+                "sabnzbd", f"history_watermark:{instance.name}",
+                self.state_store.get("sabnzbd", "history_watermark", instance.history_watermark) if legacy
+                else instance.history_watermark,
+            )
+        return instances
+
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> Optional[Pattern[str]]:
+        """Build one alternation that finds the earliest keyword in a single pass."""
+        keywords = [kw for kw in keywords if kw]
+        if not keywords:
+            return None
+        # Longest first so overlapping keywords at the same position prefer the longer one
+        return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
 
     async def get_sabnzbd_info(self) -> Dict[str, Any]:
         """Fetch download queue and disk space information from SABnzbd API."""
-        url = urljoin(self.SABNZBD_URL, "api")
-        params = {"apikey": self.SABNZBD_API_KEY, "output": "json", "mode": "queue"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if not response.ok:
-                        error_text = await response.text()
-                        self.logger.error(f"SABnzbd API error - Status {response.status}: {error_text}")
-                        return {"downloads": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown"}
-                    data = await response.json()
-
-            queue = data.get("queue", {})
-            slots = queue.get("slots", [])
-            disk_space = queue.get("diskspace1", "Unknown")
-            total_disk_space = queue.get("diskspacetotal1", "Unknown")
+            return await self.fetch_queue()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"SABnzbd API request failed: {e!r}")
+            return {"downloads": [], "instances": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown"}
+
+    async def _request_queue(self, instance: SABInstance, start: int, limit: int) -> Dict[str, Any]:
+        """Request one page of the queue; SAB returns the queue totals with every page."""
+        data = await self._request(instance, "queue", start, limit)
+        return data.get("queue", {})
+
+    async def _request(self, instance: SABInstance, mode: str, start: int, limit: int) -> Dict[str, Any]:
+        """Call a paged SAB API mode, raising on HTTP errors."""
+        url = urljoin(instance.url, "api")
+        params = {
+            "apikey": instance.api_key,
+            "output": "json",
+            "mode": mode,
+            "start": str(start),
+            "limit": str(limit),
+        }
+        async with self.http_service.session.get(
+            url, params=params, timeout=self.http_service.timeout("sabnzbd")
+        ) as response:
+            if not response.ok:
+                error_text = await response.text()
+                self.logger.error(f"SABnzbd {instance.name} API error - Status {response.status}: {error_text}")
+                raise aiohttp.ClientError(f"SABnzbd {instance.name} returned HTTP {response.status}")
+            return await response.json()
 
+    async def _gather_instances(self, fetch: Any) -> List[Any]:
+        """Run ``fetch(instance)`` on every instance at once, each under its own timeout.
+
+        Failures are returned as exceptions in place of results, so one dead
+        instance neither delays nor fails the others.
+        """
+        return await asyncio.gather(
+            *(asyncio.wait_for(fetch(instance), timeout=instance.timeout) for instance in self.instances),
+            return_exceptions=True,
+        )
+
+    async def fetch_queue(self) -> Dict[str, Any]:
+        """Fetch the top ``queue_limit`` slots plus totals from every instance and merge them.
+
+        Downloads are ranked across instances: unpaused ones first, soonest to
+        finish first. Raises only if no instance answered, so the scheduler can
+        keep the last good value.
+        """
+        results = await self._gather_instances(self._fetch_instance_queue)
+        downloads: List[Dict[str, Any]] = []
+        instances: List[Dict[str, Any]] = []
+        for instance, result in zip(self.instances, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"SABnzbd instance {instance.name} failed: {result!r}")
+                instances.append({"name": instance.name, "online": False, "error": str(result) or type(result).__name__})
+                continue
+            downloads.extend(result.pop("downloads"))
+            instances.append(result)
+
+        online = [instance for instance in instances if instance["online"]]
+        if not online:
+            raise aiohttp.ClientError("No SABnzbd instance responded")
+
+        downloads.sort(key=lambda download: (not download["active"], download["seconds_left"]))
+        downloads = downloads[:self.queue_limit]
+        # Forget trimmed names of downloads that left the rendered slots
+        current_ids = {download["nzo_id"] for download in downloads}
+        self._trimmed_names = {k: v for k, v in self._trimmed_names.items() if k in current_ids}
+        return {
+            "downloads": downloads,
+            "instances": instances,
+            "total_slots": sum(instance["total_slots"] for instance in online),
+            "sizeleft": self._format_size(str(sum(instance["mbleft"] for instance in online) * 1024 * 1024)),
+            "diskspace1": online[0]["diskspace1"],
+            "diskspacetotal1": online[0]["diskspacetotal1"],
+        }
+
+    async def _fetch_instance_queue(self, instance: SABInstance) -> Dict[str, Any]:
+        queue = await self._request_queue(instance, 0, self.queue_limit)
+        slots = queue.get("slots", [])
+        speed = instance.speed.add(float(queue.get("kbpersec", 0) or 0), time.monotonic())
+        downloads = [self._slot_to_download(item, queue, instance) for item in slots[:self.queue_limit]]
+
+        # SAB works through the queue in order, so each slot finishes after the unpaused ones ahead of it
+        mb_ahead = 0.0
+        for download in downloads:
+            if not download["active"]:
+                continue
+            mb_ahead += download["mbleft"]
+            download["seconds_left"] = mb_ahead * 1024 / speed if speed > 0 else math.inf
+            download["timeleft"] = self._format_eta(download["seconds_left"])
+
+        mbleft = float(queue.get("mbleft", 0) or 0)
+        return {
+            "name": instance.name,
+            "online": True,
+            "downloads": downloads,
+            "total_slots": int(queue.get("noofslots_total", len(slots)) or 0),
+            "mbleft": mbleft,
+            "sizeleft": queue.get("sizeleft", "Unknown"),
+            "timeleft": self._format_eta(mbleft * 1024 / speed if speed > 0 else math.inf),
+            "speed": self._format_speed_from_kbps(str(speed)),
+            "diskspace1": self._format_size_diskspace(queue.get("diskspace1", "Unknown")),
+            "diskspacetotal1": self._format_size_diskspace(queue.get("diskspacetotal1", "Unknown"), "TB"),
+        }
+
+    async def iter_queue(self, instance: SABInstance) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream one instance's whole queue one page of ``page_size`` slots at a time."""
+        start = 0
+        while True:
+            queue = await self._request_queue(instance, start, self.page_size)
+            slots = queue.get("slots", [])
             if not slots:
-                return {
-                    "downloads": [],
-                    "diskspace1": self._format_size_diskspace(disk_space),
-                    "diskspacetotal1": self._format_size_diskspace(total_disk_space, "TB"),
-                }
-
-            downloads = [
-                {
-                    "name": item.get("filename", "Unknown"),
-                    "progress": float(item.get("percentage", "0")),
-                    "timeleft": item.get("timeleft", "Unknown"),
-                    "speed": self._format_speed_from_kbps(queue.get("kbpersec", "0")),
-                    "size": self._format_size(item.get("size", "Unknown")),
-                }
-                for item in slots
-            ]
-            return {
-                "downloads": downloads,
-                "diskspace1": self._format_size_diskspace(disk_space),
-                "diskspacetotal1": self._format_size_diskspace(total_disk_space, "TB"),
-            }
-        except aiohttp.ClientError as e:
-            self.logger.error(f"SABnzbd API request failed: {e}")
-            return {"downloads": [], "diskspace1": "Unknown", "diskspacetotal1": "Unknown"}
+                return
+            yield [self._slot_to_download(item, queue, instance) for item in slots]
+            start += len(slots)
+            if start >= int(queue.get("noofslots_total", 0) or 0):
+                return
+
+    async def tail_history(self, instance: SABInstance) -> int:
+        """Store history entries that finished after the watermark; returns how many were new.
+
+        SAB lists history newest first, so pages are read until an entry older
+        than the watermark (or the retention window) shows up. Entries in the
+        watermark's own second come in no set order, so those already seen are
+        skipped rather than ending the scan. Usually this is within the first
+        small page.
+        """
+        watermark = float(instance.history_watermark.get("completed", 0))
+        seen_at_watermark = set(instance.history_watermark.get("nzo_ids", []))
+        cutoff = max(watermark, time.time() - self.history_retention)
+
+        new_entries: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            history = (await self._request(instance, "history", start, self.history_page_size)).get("history", {})
+            slots = history.get("slots", []) if isinstance(history, dict) else []
+            reached_known = False
+            for slot in slots:
+                completed = float(slot.get("completed") or 0)
+                if not completed:
+                    continue  # Still post-processing; picked up once it finishes
+                if completed < cutoff:
+                    reached_known = True
+                    break
+                if completed == watermark and slot.get("nzo_id") in seen_at_watermark:
+                    continue
+                new_entries.append({
+                    "nzo_id": slot.get("nzo_id"),
+                    "name": slot.get("name", "Unknown"),
+                    "status": slot.get("status", "Unknown"),
+                    "completed": completed,
+                    "bytes": int(slot.get("bytes") or 0),
+                })
+            if reached_known or len(slots) < self.history_page_size:
+                break
+            start += len(slots)
+
+        expiry = time.time() - self.history_retention
+        pruned = [entry for entry in instance.history if entry["completed"] >= expiry]
+        if not new_entries and len(pruned) == len(instance.history):
+            return 0
+
+        instance.history = sorted(pruned + new_entries, key=lambda entry: entry["completed"])
+        if new_entries:
+            newest = max(entry["completed"] for entry in new_entries)
+            ids = [entry["nzo_id"] for entry in new_entries if entry["completed"] == newest]
+            if newest == watermark:
+                ids += list(seen_at_watermark)
+            instance.history_watermark = {"completed": newest, "nzo_ids": ids}
+            self.state_store.set("sabnzbd", f"history_watermark:{instance.name}", instance.history_watermark)
+        self.state_store.set("sabnzbd", f"history:{instance.name}", instance.history)
+        return len(new_entries)
+
+    def history_summary(self, since: float) -> Dict[str, Any]:
+        """Completed and failed downloads since ``since`` across all instances, from the local history only."""
+        entries = [entry for instance in self.instances for entry in instance.history if entry["completed"] >= since]
+        completed = [entry for entry in entries if entry["status"] == "Completed"]
+        return {
+            "completed": len(completed),
+            "failed": sum(1 for entry in entries if entry["status"] == "Failed"),
+            "bytes": sum(entry["bytes"] for entry in completed),
+        }
+
+    def downloaded_today(self) -> Dict[str, Any]:
+        """History summary since local midnight."""
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.history_summary(midnight.timestamp())
+
+    async def collect_history(self) -> Dict[str, Any]:
+        """Collector: tail every instance's history, then summarize today's downloads."""
+        results = await self._gather_instances(self.tail_history)
+        for instance, result in zip(self.instances, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"SABnzbd history for {instance.name} failed: {result!r}")
+            elif result:
+                self.logger.debug(f"Stored {result} new SABnzbd history entries for {instance.name}")
+        if all(isinstance(result, Exception) for result in results):
+            raise aiohttp.ClientError("No SABnzbd instance returned its history")
+        summary = self.downloaded_today()
+        summary["size"] = self._format_size(str(summary["bytes"]))
+        return summary
+
+    @staticmethod
+    def _parse_timeleft(timeleft: str) -> float:
+        """Seconds from SAB's ``[D:]H:MM:SS`` time left; unknown sorts last."""
+        try:
+            parts = [int(part) for part in timeleft.split(":")]
+        except (AttributeError, ValueError):
+            return math.inf
+        # The leading field of a four-part value is days, not hours
+        days = parts.pop(0) if len(parts) == 4 else 0
+        seconds = 0
+        for part in parts:
+            seconds = seconds * 60 + part
+        return days * 86400 + seconds
+
+    @staticmethod
+    def _format_eta(seconds: float) -> str:
+        """Format seconds the way SAB does, ``[D:]H:MM:SS``."""
+        if math.isinf(seconds):
+            return "Unknown"
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        if days:
+            return f"{days}:{hours:02d}:{minutes:02d}:{secs:02d}"
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+
+    def _slot_to_download(self, item: Dict[str, Any], queue: Dict[str, Any], instance: SABInstance) -> Dict[str, Any]:
+        active = item.get("status") != "Paused"  # Downloading now or queued behind it
+        smoothed = instance.speed.smoothed
+        return {
+            "instance": instance.name,
+            "nzo_id": item.get("nzo_id"),
+            "name": item.get("filename", "Unknown"),
+            "progress": float(item.get("percentage", "0")),
+            "timeleft": item.get("timeleft", "Unknown"),
+            "seconds_left": self._parse_timeleft(item.get("timeleft", "")) if active else math.inf,
+            "active": active,
+            "mbleft": float(item.get("mbleft", 0) or 0),
+            "speed": self._format_speed_from_kbps(str(smoothed) if smoothed is not None else queue.get("kbpersec", "0")),
+            "size": self._format_size(item.get("size", "Unknown")),
+        }
+
+    @app_commands.command(name="sab_queue", description="Export the full SABnzbd queue")
+    @app_commands.check(is_authorized)
+    async def sab_queue(self, interaction: discord.Interaction):
+        """Page through every instance's whole queue and send it as a text file."""
+        await interaction.response.defer(ephemeral=True)
+
+        if not self.instances:
+            await interaction.followup.send("❌ SABnzbd is not configured.", ephemeral=True)
+            return
+
+        buffer = io.StringIO()
+        count = 0
+        for instance in self.instances:
+            buffer.write(
+                f"== {instance.name} (average {self._format_speed_from_kbps(str(instance.speed.average))} "
+                f"over the last {instance.speed.count} polls) ==\n"
+            )
+            try:
+                async for page in self.iter_queue(instance):
+                    for download in page:
+                        count += 1
+                        buffer.write(
+                            f"{count:>5}. {download['name']} | {download['progress']:.1f}% | "
+                            f"{download['size']} | {download['timeleft']}\n"
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error(f"Error exporting SABnzbd queue for {instance.name}: {e!r}")
+                buffer.write(f"   Could not fetch the queue: {e!r}\n")
+
+        if not count:
+            await interaction.followup.send("✅ The SABnzbd queue is empty.", ephemeral=True)
+            return
+        file = discord.File(io.BytesIO(buffer.getvalue().encode("utf-8")), filename="sabnzbd_queue.txt")
+        await interaction.followup.send(f"📥 {count} downloads in the SABnzbd queue", file=file, ephemeral=True)
 
     def _format_size(self, size: str) -> str:
         """Convert size to human-readable format with appropriate units."""
@@ -113,6 +492,19 @@ class SABnzbd(commands.Cog):
         except ValueError:
             return size
 
+    def _trim_name(self, name: str, nzo_id: Optional[str] = None) -> str:
+        """Cut the name at the first keyword and shorten it, memoized per SAB nzo_id."""
+        cached = self._trimmed_names.get(nzo_id) if nzo_id else None
+        if cached and cached[0] == name:
+            return cached[1]
+        match = self._keyword_pattern.search(name) if self._keyword_pattern else None
+        trimmed = (name[:match.start()] if match else name).strip()
+        if len(trimmed) > 40:
+            trimmed = trimmed[:37] + "..."
+        if nzo_id:
+            self._trimmed_names[nzo_id] = (name, trimmed)
+        return trimmed
+
     def format_download_info(self, download: Dict[str, Any], index: int) -> str:
         """Format download details into a Discord-friendly string with numbered emoji."""
         try:
@@ -120,18 +512,13 @@ class SABnzbd(commands.Cog):
             emoji = number_emojis[index] if index < len(number_emojis) else "➡️"
             progress_percent = float(download["progress"])
             progress_bar = f"[{'▓' * int(progress_percent / 10)}{'░' * (10 - int(progress_percent / 10))}]"
-            name = download["name"]
-            min_pos = min(
-                [name.find(kw) for kw in self.keywords if kw in name], default=len(name)
-            )
-            name = name[:min_pos].strip()
-            if len(name) > 40:
-                name = name[:37] + "..."
+            name = self._trim_name(download["name"], download.get("nzo_id"))
+            instance = f" | {download['instance']}" if len(self.instances) > 1 and download.get("instance") else ""
 
             return (
                 f"**```{emoji} {name}\n"
                 f"└─ {progress_bar} {progress_percent:.1f}% | {download['timeleft']} remaining\n"
-                f" └─ 📊 {download['speed']} | Size: {download['size']}```**"
+                f" └─ 📊 {download['speed']} | Size: {download['size']}{instance}```**"
             )
         except (ValueError, KeyError) as e:
             self.logger.error(f"Error formatting download info: {e}")
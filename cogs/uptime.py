@@ -1,15 +1,21 @@
 from discord.ext import commands
+import asyncio
 import logging
 import os
-from uptime_kuma_api import UptimeKumaApi, UptimeKumaException
-from typing import Tuple, Optional
+from uptime_kuma_api import UptimeKumaException
+from typing import Any, Dict, Tuple, Optional
 from dotenv import load_dotenv
+from services.uptime_kuma import UptimeKumaWorker, UptimeSnapshot
 
 RUNNING_IN_DOCKER = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
 
 if not RUNNING_IN_DOCKER:
     load_dotenv()
 
+# Beats change slowly, so Kuma is only queried once the cached stats are this old
+UPTIME_POLL_INTERVAL = 300
+UPTIME_DEADLINE = 20
+
 class Uptime(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
@@ -18,6 +24,8 @@ class Uptime(commands.Cog):
         self.username = os.getenv("UPTIME_USERNAME")
         self.password = os.getenv("UPTIME_PASSWORD")
         self.monitor_id = os.getenv("UPTIME_MONITOR_ID")
+        self.push = os.getenv("UPTIME_PUSH", "false").lower() == "true"
+        self._cycle_task: Optional[asyncio.Task] = None
         if self.monitor_id:
             try:
                 self.monitor_id = int(self.monitor_id)
@@ -28,36 +36,64 @@ class Uptime(commands.Cog):
             self.logger.info("UPTIME_MONITOR_ID not set, uptime monitoring will be disabled")
             self.monitor_id = None
 
-    def get_uptime_data(self) -> Tuple[
+        # Kuma is only ever talked to from the worker thread, over one persistent connection
+        self.worker: Optional[UptimeKumaWorker] = None
+        if all([self.api_url, self.username, self.password, self.monitor_id]):
+            self.worker = UptimeKumaWorker(
+                self.api_url, self.username, self.password, self.monitor_id,
+                store=bot.state_store, push=self.push, on_status_change=self._on_status_change,
+            )
+            self.worker.start()
+            bot.poll_scheduler.add_collector("uptime", self.collect_uptime, deadline=UPTIME_DEADLINE)
+
+    def cog_unload(self) -> None:
+        """Stop contributing to the collection cycle and release the Kuma connection."""
+        self.bot.poll_scheduler.remove_collector("uptime")
+        if self._cycle_task:
+            self._cycle_task.cancel()
+        if self.worker:
+            self.worker.close()
+
+    def _on_status_change(self, snapshot: UptimeSnapshot) -> None:
+        """Pushed UP/DOWN transition: run a collection cycle now instead of waiting for the next one.
+
+        The cycle is forced through EmbyCore so the dashboard's minimum publish
+        interval does not hold the change back.
+        """
+        if self._cycle_task is None or self._cycle_task.done():
+            emby = self.bot.get_cog("EmbyCore")
+            cycle = emby.run_forced_cycle() if emby else self.bot.poll_scheduler.run_cycle()
+            self._cycle_task = asyncio.create_task(cycle)
+
+    async def collect_uptime(self) -> Dict[str, Any]:
+        """Collector: cached statistics, refreshed on the worker thread once they are too old.
+
+        In push mode the cache is kept current by heartbeat events, so Kuma is
+        only queried if the socket has gone quiet.
+        """
+        snapshot = await self.worker.get(UPTIME_POLL_INTERVAL)
+        return {
+            "uptime_24h": snapshot.uptime_24h, "online_24h": snapshot.online_24h,
+            "uptime_7d": snapshot.uptime_7d, "online_7d": snapshot.online_7d,
+            "uptime_30d": snapshot.uptime_30d, "online_30d": snapshot.online_30d,
+            "last_offline": snapshot.last_offline,
+            "fetched_at": snapshot.fetched_at,
+        }
+
+    async def get_uptime_data(self, max_age: float = UPTIME_POLL_INTERVAL) -> Tuple[
         Optional[float], Optional[float], Optional[float],
         Optional[float], Optional[float], Optional[float], Optional[str]
     ]:
-        """Fetch uptime statistics from Uptime Kuma for specified monitor."""
-        if not all([self.api_url, self.username, self.password, self.monitor_id]):
+        """Fetch uptime statistics from Uptime Kuma for specified monitor.
+
+        Served from the worker's cached snapshot while it is younger than ``max_age``.
+        """
+        if self.worker is None:
             self.logger.debug("Uptime monitoring is disabled due to missing configuration")
             return None, None, None, None, None, None, None
         try:
-            with UptimeKumaApi(self.api_url) as api:
-                api.login(self.username, self.password)
-                beats_24h = api.get_monitor_beats(self.monitor_id, 24)
-                beats_7d = api.get_monitor_beats(self.monitor_id, 7 * 24)
-                beats_30d = api.get_monitor_beats(self.monitor_id, 30 * 24)
-
-                def calculate_uptime_and_online_time(beats: list, period_hours: int) -> Tuple[float, float]:
-                    up_count = sum(1 for beat in beats if beat["status"].name == "UP")
-                    uptime_percent = (up_count / len(beats)) * 100 if beats else 0.0
-                    online_minutes = up_count * (period_hours * 60 / len(beats)) if beats else 0
-                    return uptime_percent, online_minutes
-
-                uptime_24h, online_24h = calculate_uptime_and_online_time(beats_24h, 24)
-                uptime_7d, online_7d = calculate_uptime_and_online_time(beats_7d, 7 * 24)
-                uptime_30d, online_30d = calculate_uptime_and_online_time(beats_30d, 30 * 24)
-
-                last_offline = next(
-                    (beat["time"] for beat in reversed(beats_30d) if beat["status"].name == "DOWN"),
-                    None,
-                )
-                return uptime_24h, online_24h, uptime_7d, online_7d, uptime_30d, online_30d, last_offline
+            snapshot = await self.worker.get(max_age)
+            return snapshot.as_tuple()
         except UptimeKumaException as e:
             self.logger.error(f"Uptime Kuma API error: {e}")
             return None, None, None, None, None, None, None
@@ -70,4 +106,4 @@ class Uptime(commands.Cog):
 
 async def setup(bot: commands.Bot) -> None:
     """Set up the Uptime cog for the bot."""
-    await bot.add_cog(Uptime(bot))
\ No newline at end of file
+    await bot.add_cog(Uptime(bot))
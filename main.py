@@ -6,7 +6,15 @@ from logging.handlers import TimedRotatingFileHandler
 from dotenv import load_dotenv
 import asyncio
 import platform
-from typing import List
+import json
+import hashlib
+from typing import Dict, Any
+from services.http_service import HTTPService
+from services.state_store import StateStore
+from services.presence import PresenceManager
+from services.scheduler import PollScheduler
+# Lives outside main so cogs can import it without running this script a second time
+from auth import is_authorized
 
 # Configure event loop policy for Windows compatibility
 if platform.system() == "Windows":
@@ -20,9 +28,6 @@ if not RUNNING_IN_DOCKER:
 TOKEN = os.getenv("DISCORD_TOKEN")
 if not TOKEN:
     raise ValueError("DISCORD_TOKEN must be set in .env file")
-AUTHORIZED_USERS: List[int] = [
-    int(user_id) for user_id in os.getenv("DISCORD_AUTHORIZED_USERS", "").split(",") if user_id
-]
 
 # Setup logging with rotation
 LOG_DIR = "logs"
@@ -47,36 +52,92 @@ else:
     file_handler.setFormatter(formatter)
     bot_logger.addHandler(file_handler)
 
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+STATE_DB_FILE = os.path.join(DATA_DIR, "state.db")
+
+def load_config_section(section: str) -> Dict[str, Any]:
+    """Read a single top-level section from config.json, empty if unavailable."""
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get(section, {})
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        bot_logger.error(f"Failed to load '{section}' config: {e}. Using defaults.")
+        return {}
+
+class EmbyWatchBot(commands.Bot):
+    """Bot that owns the services shared by all cogs."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.http_service = HTTPService.from_config(load_config_section("http"))
+        self.state_store = StateStore(
+            STATE_DB_FILE, flush_interval=float(load_config_section("state").get("flush_interval", 2.0))
+        )
+        self.presence_manager = PresenceManager.from_config(self, load_config_section("presence"))
+        self.poll_scheduler = PollScheduler.from_config(load_config_section("polling"))
+
+    async def setup_hook(self) -> None:
+        """Load cogs and sync commands once per process; ``on_ready`` fires again on every reconnect."""
+        await load_cogs()
+        await sync_command_tree()
+
+    async def close(self) -> None:
+        """Unload cogs first, then release pooled connections and flush persisted state."""
+        self.presence_manager.close()
+        await super().close()
+        await self.http_service.close()
+        await asyncio.get_running_loop().run_in_executor(None, self.state_store.close)
+
 # Initialize bot with intents and command prefix
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = EmbyWatchBot(command_prefix="!", intents=intents)
 tree = bot.tree
 
-def is_authorized(interaction: discord.Interaction) -> bool:
-    """Check if the user is authorized to execute privileged commands."""
-    return interaction.user.id in AUTHORIZED_USERS
+async def load_cog(name: str) -> None:
+    """Load a single cog, logging instead of raising on failure."""
+    try:
+        await bot.load_extension(f"cogs.{name}")
+        bot_logger.info(f"Loaded cog: {name}")
+    except commands.ExtensionError as e:
+        bot_logger.error(f"Failed to load cog {name}: {e}")
 
 async def load_cogs() -> None:
-    """Load all Python files in the 'cogs' directory as bot extensions."""
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("__") and filename != "jellyfin_core.py":
-
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                bot_logger.info(f"Loaded cog: {filename[:-3]}")
-            except commands.ExtensionError as e:
-                bot_logger.error(f"Failed to load cog {filename[:-3]}: {e}")
-
-@bot.event
-async def on_ready() -> None:
-    """Handle bot startup: log readiness, load cogs, and sync command tree."""
-    bot_logger.info(f"Bot is online as {bot.user.name}")
-    await load_cogs()
+    """Load all Python files in the 'cogs' directory as bot extensions, concurrently."""
+    names = [
+        filename[:-3] for filename in os.listdir("./cogs")
+        if filename.endswith(".py") and not filename.startswith("__") and filename != "jellyfin_core.py"
+    ]
+    await asyncio.gather(*(load_cog(name) for name in names))
+
+def command_tree_hash() -> str:
+    """Hash the global command payload that ``tree.sync()`` would upload."""
+    commands_list = tree.get_commands()
+    try:
+        payload = [command.to_dict(tree) for command in commands_list]
+    except TypeError:  # discord.py before 2.4 builds the payload without the tree
+        payload = [command.to_dict() for command in commands_list]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+async def sync_command_tree() -> None:
+    """Sync the command tree only when the registered commands differ from the last sync."""
+    tree_hash = command_tree_hash()
+    if tree_hash == bot.state_store.get("commands", "sync_hash"):
+        bot_logger.info("Command tree unchanged since the last sync, skipping")
+        return
     try:
         await tree.sync()
-        bot_logger.info("Command tree synced")
     except discord.HTTPException as e:
         bot_logger.error(f"Failed to sync command tree: {e}")
+        return
+    bot.state_store.set("commands", "sync_hash", tree_hash)
+    bot_logger.info("Command tree synced")
+
+@bot.event
+async def on_ready() -> None:
+    """Log readiness; cogs and commands are set up once in ``setup_hook``."""
+    bot_logger.info(f"Bot is online as {bot.user.name}")
 
 @tree.command(name="load", description="Load a specific cog")
 async def load(interaction: discord.Interaction, cog: str) -> None:
@@ -88,6 +149,7 @@ async def load(interaction: discord.Interaction, cog: str) -> None:
     try:
         await bot.load_extension(f"cogs.{cog}")
         await interaction.followup.send(f"✅ Cog `{cog}` loaded successfully!")
+        await sync_command_tree()
         bot_logger.info(f"Cog {cog} loaded by {interaction.user}")
     except commands.ExtensionError as e:
         await interaction.followup.send(f"❌ Error loading cog `{cog}`: `{e}`")
@@ -103,6 +165,7 @@ async def unload(interaction: discord.Interaction, cog: str) -> None:
     try:
         await bot.unload_extension(f"cogs.{cog}")
         await interaction.followup.send(f"✅ Cog `{cog}` unloaded successfully!")
+        await sync_command_tree()
         bot_logger.info(f"Cog {cog} unloaded by {interaction.user}")
     except commands.ExtensionError as e:
         await interaction.followup.send(f"❌ Error unloading cog `{cog}`: `{e}`")
@@ -118,6 +181,7 @@ async def reload(interaction: discord.Interaction, cog: str) -> None:
     try:
         await bot.reload_extension(f"cogs.{cog}")
         await interaction.followup.send(f"✅ Cog `{cog}` reloaded successfully!")
+        await sync_command_tree()
         bot_logger.info(f"Cog {cog} reloaded by {interaction.user}")
     except commands.ExtensionError as e:
         await interaction.followup.send(f"❌ Error reloading cog `{cog}`: `{e}`")
@@ -0,0 +1,98 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """Tracks whether a backend is reachable so callers can fail fast while it is not.
+
+    The circuit opens after ``failure_threshold`` consecutive failures. While
+    open, requests are refused without touching the network and only a probe
+    is allowed once its delay has passed; the delay starts at ``base_delay``
+    and doubles after every failed probe up to ``max_delay``. A successful
+    probe half-opens the circuit: the next real request closes it again, or
+    reopens it immediately if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 3, base_delay: float = 10.0, max_delay: float = 300.0
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.circuit")
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None  # Wall-clock time the backend was first seen down
+        self._delay = base_delay
+        self._next_probe = 0.0
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "CircuitBreaker":
+        """Create a breaker from the ``circuit_breaker`` section of config.json."""
+        return cls(
+            name,
+            failure_threshold=int(config.get("failure_threshold", 3)),
+            base_delay=float(config.get("base_delay", 10)),
+            max_delay=float(config.get("max_delay", 300)),
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def probe_due(self) -> bool:
+        """Whether an open circuit may send its next probe."""
+        return self.is_open and time.monotonic() >= self._next_probe
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe, zero unless the circuit is open."""
+        return max(0.0, self._next_probe - time.monotonic()) if self.is_open else 0.0
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            self.logger.info(f"{self.name} is reachable again, closing circuit")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._delay = self.base_delay
+
+    def record_probe_success(self) -> None:
+        """A probe got through; let real requests decide whether to close."""
+        if self.is_open:
+            self.state = self.HALF_OPEN
+            self.logger.info(f"{self.name} answered a probe, half-opening circuit")
+
+    def record_failure(self) -> None:
+        """A real request failed; requests still in flight when the circuit opened are ignored."""
+        if self.is_open:
+            return
+        self.failures += 1
+        if self.state == self.CLOSED and self.failures < self.failure_threshold:
+            return
+        if self.state == self.CLOSED:
+            self.opened_at = time.time()
+            self._delay = self.base_delay
+            self.logger.warning(f"{self.name} failed {self.failures} times in a row, opening circuit")
+        else:
+            # A failure right after a successful probe
+            self._delay = min(self._delay * 2, self.max_delay)
+        self._open()
+
+    def record_probe_failure(self) -> None:
+        """A probe failed; back off further before the next one."""
+        if not self.is_open:
+            return
+        self._delay = min(self._delay * 2, self.max_delay)
+        self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._next_probe = time.monotonic() + self._delay
+        self.logger.debug(f"Next {self.name} probe in {self._delay:.0f}s")
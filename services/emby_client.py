@@ -0,0 +1,252 @@
+import asyncio
+import logging
+from typing import Any, Dict, NamedTuple, Optional
+
+import aiohttp
+
+from services.circuit_breaker import CircuitBreaker
+from services.http_service import HTTPService
+from services.singleflight import SingleFlight
+
+CLIENT_NAME = "EmbyWatch"
+CLIENT_VERSION = "1.0.0"
+DEVICE_ID = "embywatch-bot"
+
+# Errors that mean the server could not be reached, as opposed to rejecting the request
+CONNECTION_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+class EmbyResponse(NamedTuple):
+    """Result of an Emby API call: parsed JSON on success, error text otherwise."""
+
+    status: int
+    data: Any
+    url: str
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class EmbyClient:
+    """Authenticated client for the Emby REST API.
+
+    Headers are built once and the current token is attached to them. When a
+    request is rejected with 401 the client re-authenticates once and retries,
+    so a revoked or expired token recovers on the same call instead of failing
+    every poll until restart.
+
+    Connection failures and 5xx responses feed a :class:`CircuitBreaker`. While
+    it is open, requests return a synthetic 503 immediately and the server is
+    only probed through the unauthenticated ``/System/Ping`` endpoint.
+    """
+
+    def __init__(
+        self,
+        http_service: HTTPService,
+        base_url: str,
+        api_key: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        probe_timeout: float = 3.0,
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.emby.client")
+        self.http_service = http_service
+        self.base_url = (base_url or "").rstrip("/")
+        self.api_key = api_key
+        self.username = username
+        self.password = password
+        self.breaker = breaker or CircuitBreaker("Emby")
+        self.probe_timeout = probe_timeout
+
+        self.token: Optional[str] = None
+        self.user_id: Optional[str] = None
+        self.auth_method: Optional[str] = None  # "api_key" or "credentials"
+
+        self._base_headers = {
+            "X-Emby-Client": CLIENT_NAME,
+            "X-Emby-Client-Version": CLIENT_VERSION,
+            "X-Emby-Device-Name": CLIENT_NAME,
+            "X-Emby-Device-Id": DEVICE_ID,
+            "Accept": "application/json",
+            "X-Emby-Authorization": (
+                f'MediaBrowser Client="{CLIENT_NAME}", Device="{CLIENT_NAME}", '
+                f'DeviceId="{DEVICE_ID}", Version="{CLIENT_VERSION}"'
+            ),
+        }
+        self._headers: Dict[str, str] = dict(self._base_headers)
+        self._auth_lock = asyncio.Lock()
+        self._flights = SingleFlight()
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.token is not None
+
+    async def ensure_available(self) -> bool:
+        """Whether requests may go out; probes the server when an open circuit allows it."""
+        if not self.breaker.is_open:
+            return True
+        if not self.breaker.probe_due():
+            return False
+        return await self._flights.do("probe", self.ping)
+
+    async def ping(self) -> bool:
+        """Cheap reachability check against ``/System/Ping`` with a short timeout."""
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.probe_timeout)
+            async with self.http_service.session.get(
+                f"{self.base_url}/System/Ping", headers=self._base_headers, timeout=timeout
+            ) as response:
+                reachable = response.status < 500
+        except CONNECTION_ERRORS as e:
+            self.logger.debug(f"Emby ping failed: {e!r}")
+            reachable = False
+        if reachable:
+            self.breaker.record_probe_success()
+        else:
+            self.breaker.record_probe_failure()
+        return reachable
+
+    def _set_token(self, token: Optional[str], method: Optional[str], user_id: Optional[str] = None) -> None:
+        """Store the token and rebuild the request headers around it."""
+        self.token = token
+        self.auth_method = method
+        self.user_id = user_id
+        self._headers = dict(self._base_headers)
+        if token:
+            self._headers["X-Emby-Token"] = token
+
+    async def authenticate(self, stale_token: Optional[str] = None) -> bool:
+        """Obtain a token, reusing the current one unless it is ``stale_token``.
+
+        Tries the API key first and falls back to username/password when the
+        key is missing or rejected. Concurrent callers share a single attempt.
+        """
+        async with self._auth_lock:
+            if self.token and self.token != stale_token:
+                return True
+            if not await self.ensure_available():
+                return False
+            try:
+                authenticated = await self._authenticate()
+            except CONNECTION_ERRORS:
+                self.breaker.record_failure()
+                raise
+            if authenticated:
+                self.breaker.record_success()
+            return authenticated
+
+    async def _authenticate(self) -> bool:
+        """Run the API key / credentials handshake; callers hold the auth lock."""
+        self._set_token(None, None)
+        if self.api_key:
+            headers = {**self._base_headers, "X-Emby-Token": self.api_key}
+            async with self.http_service.session.get(
+                f"{self.base_url}/System/Info", headers=headers, timeout=self.http_service.timeout("emby")
+            ) as response:
+                if response.status == 200:
+                    self._set_token(self.api_key, "api_key")
+                    self.logger.info("Successfully connected to Emby server using API key")
+                    return True
+                elif response.status == 401:
+                    self.logger.error("Invalid API key provided")
+                else:
+                    self.logger.error(f"Failed to connect with API key: HTTP {response.status}")
+                    if response.status >= 500:
+                        self.breaker.record_failure()
+                    return False
+
+        if self.username and self.password:
+            auth_data = {"Username": self.username, "Pw": self.password}
+            async with self.http_service.session.post(
+                f"{self.base_url}/Users/AuthenticateByName",
+                json=auth_data,
+                headers=self._base_headers,
+                timeout=self.http_service.timeout("emby"),
+            ) as response:
+                if response.status == 200:
+                    auth_response = await response.json()
+                    self._set_token(
+                        auth_response.get("AccessToken"),
+                        "credentials",
+                        auth_response.get("User", {}).get("Id"),
+                    )
+                    self.logger.info(f"Successfully authenticated with Emby server as {self.username}")
+                    return self.token is not None
+                elif response.status == 401:
+                    self.logger.error("Invalid username or password")
+                    return False
+                else:
+                    error_body = await response.text()
+                    self.logger.error(f"Failed to authenticate with username/password: HTTP {response.status}")
+                    self.logger.error(f"Error response: {error_body}")
+                    if response.status >= 500:
+                        self.breaker.record_failure()
+                    return False
+
+        if not self.api_key:
+            self.logger.error("No authentication method provided (API key or username/password required)")
+        return False
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        endpoint: str,
+    ) -> EmbyResponse:
+        try:
+            async with self.http_service.session.request(
+                method,
+                f"{self.base_url}{path}",
+                headers=self._headers,
+                params=params,
+                json=json,
+                timeout=self.http_service.timeout(endpoint),
+            ) as response:
+                if 200 <= response.status < 300:
+                    data = await response.json(content_type=None)
+                else:
+                    data = await response.text()
+        except CONNECTION_ERRORS:
+            self.breaker.record_failure()
+            raise
+        if response.status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return EmbyResponse(response.status, data, str(response.url))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        endpoint: str = "emby",
+    ) -> EmbyResponse:
+        """Send an authenticated request, re-authenticating once on 401.
+
+        ``endpoint`` selects the timeout class from the shared HTTP service.
+        """
+        if not await self.ensure_available():
+            return EmbyResponse(503, "Emby circuit is open", f"{self.base_url}{path}")
+        if not self.token and not await self.authenticate():
+            return EmbyResponse(401, "Not authenticated", f"{self.base_url}{path}")
+
+        token = self.token
+        response = await self._send(method, path, params, json, endpoint)
+        if response.status == 401:
+            self.logger.warning(f"Emby rejected the current token for {path}, re-authenticating")
+            if await self.authenticate(stale_token=token):
+                response = await self._send(method, path, params, json, endpoint)
+        return response
+
+    async def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None, endpoint: str = "emby"
+    ) -> EmbyResponse:
+        """Authenticated GET; concurrent identical requests share one round-trip."""
+        key = (path, tuple(sorted((params or {}).items())))
+        return await self._flights.do(key, lambda: self.request("GET", path, params=params, endpoint=endpoint))
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from services.emby_client import DEVICE_ID, EmbyClient
+
+PLAYBACK_EVENTS = {"PlaybackStart", "PlaybackStopped", "PlaybackProgress"}
+
+
+class EmbySessionTracker:
+    """Keeps an in-memory session table fed by the Emby ``/embywebsocket`` endpoint.
+
+    After connecting it subscribes to ``Sessions`` updates and applies playback
+    events as they arrive. REST polling is only needed while the socket is down
+    and for periodic reconciliation, which the owning cog drives through
+    :meth:`needs_reconcile` and :meth:`reconcile`.
+    """
+
+    def __init__(
+        self,
+        client: EmbyClient,
+        sessions_interval: float = 1.5,
+        reconcile_interval: float = 300,
+        max_backoff: float = 60,
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.emby.websocket")
+        self.client = client
+        self.sessions_interval = sessions_interval
+        self.reconcile_interval = reconcile_interval
+        self.max_backoff = max_backoff
+
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self.connected = False
+        self.last_message: Optional[float] = None
+        self.last_push: Optional[float] = None
+        self.last_reconcile: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def sessions(self) -> List[Dict[str, Any]]:
+        """Current session table as a list, in the same shape as ``/Sessions``."""
+        return list(self._sessions.values())
+
+    @property
+    def is_live(self) -> bool:
+        """Whether the table is being kept current by an open socket."""
+        return self.connected and self.last_push is not None
+
+    def needs_reconcile(self) -> bool:
+        """Whether a REST snapshot is due to correct any drift in the table."""
+        return self.last_reconcile is None or time.monotonic() - self.last_reconcile >= self.reconcile_interval
+
+    def reconcile(self, sessions: List[Dict[str, Any]]) -> None:
+        """Replace the table with an authoritative ``/Sessions`` response."""
+        self._replace(sessions)
+        self.last_reconcile = time.monotonic()
+
+    def _replace(self, sessions: List[Dict[str, Any]]) -> None:
+        self._sessions = {s["Id"]: s for s in sessions if s.get("Id")}
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    def _socket_url(self) -> str:
+        base = self.client.base_url
+        if base.startswith("https://"):
+            base = "wss://" + base[len("https://"):]
+        elif base.startswith("http://"):
+            base = "ws://" + base[len("http://"):]
+        return f"{base}/embywebsocket"
+
+    async def _run(self) -> None:
+        """Connect, consume messages and reconnect with exponential backoff."""
+        backoff = 1.0
+        while True:
+            try:
+                if not self.client.token and not await self.client.authenticate():
+                    raise ConnectionError("Emby authentication failed")
+                token = self.client.token
+                params = {"api_key": token, "deviceId": DEVICE_ID}
+                async with self.client.http_service.session.ws_connect(
+                    self._socket_url(), params=params, heartbeat=30
+                ) as ws:
+                    self.connected = True
+                    backoff = 1.0
+                    self.logger.info("Connected to Emby websocket")
+                    interval_ms = int(self.sessions_interval * 1000)
+                    await ws.send_json({"MessageType": "SessionsStart", "Data": f"0,{interval_ms}"})
+                    await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except aiohttp.WSServerHandshakeError as e:
+                if e.status == 401:
+                    await self.client.authenticate(stale_token=self.client.token)
+                self.logger.warning(f"Emby websocket handshake failed: HTTP {e.status}")
+            except Exception as e:
+                self.logger.warning(f"Emby websocket error: {e}")
+            finally:
+                self.connected = False
+                self.last_push = None
+
+            self.logger.info(f"Reconnecting to Emby websocket in {backoff:.0f}s (polling in the meantime)")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _consume(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        keepalive: Optional[asyncio.Task] = None
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+                    continue
+                try:
+                    message = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+                self.last_message = time.monotonic()
+                message_type = message.get("MessageType")
+                data = message.get("Data")
+
+                if message_type == "ForceKeepAlive" and keepalive is None:
+                    keepalive = asyncio.create_task(self._keepalive(ws, float(data or 60) / 2))
+                elif message_type == "Sessions" and isinstance(data, list):
+                    self._replace(data)
+                    self.last_push = self.last_message
+                elif message_type in PLAYBACK_EVENTS and isinstance(data, dict):
+                    self._apply_playback_event(message_type, data)
+        finally:
+            if keepalive is not None:
+                keepalive.cancel()
+
+    async def _keepalive(self, ws: aiohttp.ClientWebSocketResponse, interval: float) -> None:
+        while not ws.closed:
+            await ws.send_json({"MessageType": "KeepAlive"})
+            await asyncio.sleep(interval)
+
+    def _apply_playback_event(self, message_type: str, data: Dict[str, Any]) -> None:
+        """Patch a single session from a playback event until the next ``Sessions`` push."""
+        session_id = data.get("Id") or data.get("SessionId")
+        if not session_id:
+            return
+        session = self._sessions.setdefault(session_id, {"Id": session_id})
+        if message_type == "PlaybackStopped":
+            session.pop("NowPlayingItem", None)
+            return
+        if data.get("NowPlayingItem"):
+            session["NowPlayingItem"] = data["NowPlayingItem"]
+        if data.get("PlayState"):
+            session["PlayState"] = data["PlayState"]
+        for key in ("UserName", "Client", "DeviceName"):
+            if key in data:
+                session[key] = data[key]
@@ -0,0 +1,90 @@
+import aiohttp
+import logging
+from typing import Any, Dict, Optional
+
+# Connect, read and total timeouts in seconds per endpoint class; "default" covers the rest.
+# Library classes cover the heavy /Items scans, everything else is expected to answer quickly.
+DEFAULT_TIMEOUTS: Dict[str, Dict[str, float]] = {
+    "default": {"connect": 5, "read": 15, "total": 30},
+    "emby": {"connect": 5, "read": 10, "total": 15},
+    "emby_library": {"connect": 5, "read": 30, "total": 60},
+    "jellyfin": {"connect": 5, "read": 10, "total": 15},
+    "jellyfin_library": {"connect": 5, "read": 60, "total": 120},
+    "sabnzbd": {"connect": 3, "read": 8, "total": 10},
+}
+
+
+class HTTPService:
+    """Bot-wide HTTP transport shared by all cogs.
+
+    Holds a single aiohttp session whose connector keeps a keep-alive pool per
+    host and caches DNS lookups, so repeated polls reuse open connections
+    instead of paying a new TCP/TLS handshake on every request.
+
+    Every request should pass ``timeout=http_service.timeout(endpoint_class)``
+    so a half-open connection cannot hang a poll; the session default is the
+    ``default`` class.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 60,
+        timeouts: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.http")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._timeouts: Dict[str, aiohttp.ClientTimeout] = {}
+        for endpoint in {**DEFAULT_TIMEOUTS, **(timeouts or {})}:
+            values = {**DEFAULT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUTS["default"]), **(timeouts or {}).get(endpoint, {})}
+            self._timeouts[endpoint] = aiohttp.ClientTimeout(
+                total=float(values["total"]),
+                sock_connect=float(values["connect"]),
+                sock_read=float(values["read"]),
+            )
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HTTPService":
+        """Create the service from the ``http`` section of config.json."""
+        return cls(
+            limit=int(config.get("connection_limit", 100)),
+            limit_per_host=int(config.get("limit_per_host", 10)),
+            dns_cache_ttl=int(config.get("dns_cache_ttl", 300)),
+            keepalive_timeout=float(config.get("keepalive_timeout", 60)),
+            timeouts=config.get("timeouts"),
+        )
+
+    def timeout(self, endpoint: str) -> aiohttp.ClientTimeout:
+        """Timeouts for an endpoint class, falling back to ``default``."""
+        return self._timeouts.get(endpoint, self._timeouts["default"])
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use inside the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout("default"))
+            self.logger.debug(
+                f"Opened pooled HTTP session (limit={self.limit}, per_host={self.limit_per_host}, "
+                f"dns_ttl={self.dns_cache_ttl}s)"
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and release all pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self.logger.info("Closed pooled HTTP session")
+        self._session = None
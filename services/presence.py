@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import discord
+
+
+class PresenceManager:
+    """Bot-wide presence sender that only talks to the gateway when something changed.
+
+    Updates whose rendered activity matches what was last sent are suppressed.
+    Real changes are sent subject to a sliding window of ``max_updates`` per
+    ``window`` seconds; routine changes also respect ``min_interval``. A change
+    that cannot be sent yet is held and the latest one is flushed as soon as the
+    budget allows, while urgent changes (such as going offline) skip the
+    minimum interval and go out immediately whenever the window has room.
+    """
+
+    def __init__(self, bot: discord.Client, min_interval: float = 15.0, max_updates: int = 5, window: float = 60.0) -> None:
+        self.logger = logging.getLogger("embywatch_bot.presence")
+        self.bot = bot
+        self.min_interval = min_interval
+        self.max_updates = max(1, max_updates)
+        self.window = window
+
+        self.sent = 0
+        self.suppressed = 0
+        self._sent_at: Deque[float] = deque(maxlen=self.max_updates)
+        self._last_key: Optional[Tuple[Any, ...]] = None
+        self._pending: Optional[Tuple[Optional[discord.BaseActivity], Optional[discord.Status]]] = None
+        self._pending_key: Optional[Tuple[Any, ...]] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, bot: discord.Client, config: Dict[str, Any]) -> "PresenceManager":
+        """Create the manager from the ``presence`` section of config.json."""
+        return cls(
+            bot,
+            min_interval=float(config.get("min_interval", 15)),
+            max_updates=int(config.get("max_updates", 5)),
+            window=float(config.get("window", 60)),
+        )
+
+    @staticmethod
+    def _key(activity: Optional[discord.BaseActivity], status: Optional[discord.Status]) -> Tuple[Any, ...]:
+        if activity is None:
+            return (str(status), None, None)
+        return (str(status), getattr(activity, "type", None), getattr(activity, "name", None))
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self.sent, "suppressed": self.suppressed, "pending": int(self._pending is not None)}
+
+    def _delay(self, urgent: bool) -> float:
+        """Seconds until an update may be sent without exceeding the budget."""
+        now = time.monotonic()
+        delay = 0.0
+        if len(self._sent_at) >= self.max_updates:
+            delay = max(delay, self._sent_at[0] + self.window - now)
+        if not urgent and self._sent_at:
+            delay = max(delay, self._sent_at[-1] + self.min_interval - now)
+        return delay
+
+    async def update(
+        self,
+        activity: Optional[discord.BaseActivity],
+        status: Optional[discord.Status] = None,
+        urgent: bool = False,
+    ) -> bool:
+        """Request a presence; returns True if it was sent immediately."""
+        key = self._key(activity, status)
+        if key == (self._pending_key if self._pending is not None else self._last_key):
+            self.suppressed += 1
+            self.logger.debug(f"Presence unchanged, suppressed ({self.suppressed} total)")
+            return False
+
+        if key == self._last_key:
+            # The held change was reverted before it went out
+            self._drop_pending()
+            self.suppressed += 1
+            return False
+
+        if self._delay(urgent) <= 0:
+            self._drop_pending()
+            await self._send(activity, status, key)
+            return True
+
+        if self._pending is not None:
+            self.suppressed += 1  # Replaced before it could be sent
+        self._pending = (activity, status)
+        self._pending_key = key
+        self._schedule_flush(urgent)
+        return False
+
+    def _drop_pending(self) -> None:
+        self._pending = None
+        self._pending_key = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def _schedule_flush(self, urgent: bool) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            if not urgent:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._flush_later(urgent))
+
+    async def _flush_later(self, urgent: bool) -> None:
+        await asyncio.sleep(self._delay(urgent))
+        if self._pending is None:
+            return
+        activity, status = self._pending
+        key = self._pending_key
+        self._pending = None
+        self._pending_key = None
+        self._flush_task = None
+        await self._send(activity, status, key)
+
+    async def _send(
+        self, activity: Optional[discord.BaseActivity], status: Optional[discord.Status], key: Tuple[Any, ...]
+    ) -> None:
+        try:
+            await self.bot.change_presence(activity=activity, status=status)
+        except Exception as e:
+            self.logger.error(f"Failed to change presence: {e}")
+            return
+        self._sent_at.append(time.monotonic())
+        self._last_key = key
+        self.sent += 1
+
+    def close(self) -> None:
+        """Cancel any held update."""
+        self._drop_pending()
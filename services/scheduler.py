@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from services.singleflight import SingleFlight
+
+
+class AdaptiveInterval:
+    """Picks the next poll interval from what the server is doing.
+
+    The interval drops to ``floor`` while anything is playing or the set of
+    playing sessions changed within ``active_window`` seconds, and grows by
+    ``backoff`` per idle or offline poll up to ``ceiling``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        floor: float,
+        ceiling: float,
+        backoff: float = 1.5,
+        active_window: float = 300,
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.scheduler")
+        self.name = name
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.backoff = max(1.0, backoff)
+        self.active_window = active_window
+
+        self.current = floor
+        self._signature: Optional[FrozenSet[Tuple[Any, Any]]] = None
+        self._last_change: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any], floor: float, ceiling: float) -> "AdaptiveInterval":
+        """Create an interval from the ``polling`` section of config.json."""
+        return cls(
+            name,
+            floor=float(config.get(f"{name}_floor", floor)),
+            ceiling=float(config.get(f"{name}_ceiling", ceiling)),
+            backoff=float(config.get("backoff", 1.5)),
+            active_window=float(config.get("active_window", 300)),
+        )
+
+    @staticmethod
+    def session_signature(sessions: Iterable[Dict[str, Any]]) -> FrozenSet[Tuple[Any, Any]]:
+        """Identify what is playing: session ID paired with the item being played."""
+        return frozenset(
+            (s.get("Id"), s["NowPlayingItem"].get("Id"))
+            for s in sessions
+            if s.get("NowPlayingItem")
+        )
+
+    def observe(self, online: bool, sessions: Optional[Iterable[Dict[str, Any]]] = None) -> float:
+        """Record one poll result and return the interval until the next poll."""
+        now = time.monotonic()
+        signature = self.session_signature(sessions or [])
+        if self._signature is not None and signature != self._signature:
+            self._last_change = now
+        self._signature = signature
+
+        recently_changed = self._last_change is not None and now - self._last_change < self.active_window
+        if online and (signature or recently_changed):
+            interval = self.floor
+        else:
+            interval = min(self.ceiling, max(self.floor, self.current * self.backoff))
+
+        if interval != self.current:
+            self.logger.debug(f"{self.name} poll interval {self.current:.0f}s -> {interval:.0f}s")
+        self.current = interval
+        return interval
+
+
+@dataclass(frozen=True)
+class PollSnapshot:
+    """Immutable result of one collection cycle.
+
+    ``values`` holds the latest known result of every collector, ``errors``
+    the reason a collector failed this cycle and ``collected_at`` the
+    wall-clock time each value was fetched. A collector that failed keeps its
+    previous value, so a value can be present and stale at the same time.
+    Consumers must treat the values as read-only; they are shared by every
+    consumer of the cycle.
+    """
+
+    cycle: int
+    taken_at: float
+    values: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    errors: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    collected_at: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def ok(self, name: str) -> bool:
+        """Whether the collector produced a value and did not fail."""
+        return name in self.values and name not in self.errors
+
+    def stale(self, name: str) -> bool:
+        """Whether the value is a cached one kept after this cycle's fetch failed."""
+        return name in self.values and name in self.errors
+
+    def age(self, name: str) -> Optional[float]:
+        """Seconds since the value for ``name`` was fetched."""
+        collected_at = self.collected_at.get(name)
+        return None if collected_at is None else max(0.0, time.time() - collected_at)
+
+
+class _Collector(NamedTuple):
+    fetch: Callable[[], Awaitable[Any]]
+    deadline: float
+    every: float
+
+
+class PollScheduler:
+    """Runs every registered collector once per cycle and fans the result out.
+
+    Collectors are fetched concurrently, each bounded by its own deadline and
+    by the overall ``cycle_deadline``, so a slow service cannot hold up the
+    cycle. A collector that misses its deadline or fails keeps its last value,
+    marked stale, for up to ``max_stale`` seconds. Collectors with an ``every``
+    period are only re-fetched once it has elapsed. The finished
+    :class:`PollSnapshot` is handed to every consumer and kept as
+    :attr:`latest` for commands.
+    """
+
+    def __init__(self, cycle_deadline: float = 25.0, max_stale: float = 600.0) -> None:
+        self.logger = logging.getLogger("embywatch_bot.scheduler")
+        self.cycle_deadline = cycle_deadline
+        self.max_stale = max_stale
+        self.latest: Optional[PollSnapshot] = None
+        self._collectors: Dict[str, _Collector] = {}
+        self._consumers: Dict[str, Callable[[PollSnapshot], Awaitable[None]]] = {}
+        self._last_run: Dict[str, float] = {}
+        self._cycle = 0
+        self._flights = SingleFlight()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PollScheduler":
+        """Create the scheduler from the ``polling`` section of config.json."""
+        return cls(
+            cycle_deadline=float(config.get("cycle_deadline", 25)),
+            max_stale=float(config.get("max_stale", 600)),
+        )
+
+    def add_collector(
+        self, name: str, fetch: Callable[[], Awaitable[Any]], deadline: float = 10.0, every: float = 0.0
+    ) -> None:
+        """Register ``fetch`` under ``name``; a later registration replaces it."""
+        self._collectors[name] = _Collector(fetch, deadline, every)
+        self._last_run.pop(name, None)
+
+    def remove_collector(self, name: str) -> None:
+        self._collectors.pop(name, None)
+        self._last_run.pop(name, None)
+
+    def add_consumer(self, name: str, consume: Callable[[PollSnapshot], Awaitable[None]]) -> None:
+        self._consumers[name] = consume
+
+    def remove_consumer(self, name: str) -> None:
+        self._consumers.pop(name, None)
+
+    async def run_cycle(self) -> PollSnapshot:
+        """Collect and publish one snapshot; concurrent callers share the cycle."""
+        return await self._flights.do("cycle", self._run_cycle)
+
+    async def wait_idle(self) -> None:
+        """Wait until no cycle is running, so the next :meth:`run_cycle` starts a new one."""
+        while "cycle" in self._flights:
+            try:
+                await self._flights.do("cycle", self._run_cycle)
+            except Exception:
+                pass  # The running cycle logs its own failures; only its completion matters here
+
+    def _is_due(self, name: str, collector: _Collector) -> bool:
+        last_run = self._last_run.get(name)
+        return last_run is None or time.monotonic() - last_run >= collector.every
+
+    async def _run_cycle(self) -> PollSnapshot:
+        previous = self.latest
+        due = {name: c for name, c in self._collectors.items() if self._is_due(name, c)}
+        results = await asyncio.gather(*(self._collect(name, c) for name, c in due.items()))
+
+        values: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        collected_at: Dict[str, float] = {}
+        if previous is not None:
+            # Carry forward values that were not due, or that failed and are not too old
+            for name in self._collectors:
+                if name in previous.values and (name not in due or (previous.age(name) or 0.0) < self.max_stale):
+                    values[name] = previous.values[name]
+                    collected_at[name] = previous.collected_at[name]
+        for name, (value, error) in zip(due, results):
+            if error is not None:
+                errors[name] = error
+                continue
+            values[name] = value
+            collected_at[name] = time.time()
+            self._last_run[name] = time.monotonic()
+
+        self._cycle += 1
+        snapshot = PollSnapshot(
+            cycle=self._cycle,
+            taken_at=time.time(),
+            values=MappingProxyType(values),
+            errors=MappingProxyType(errors),
+            collected_at=MappingProxyType(collected_at),
+        )
+        self.latest = snapshot
+        await asyncio.gather(*(self._deliver(name, consume, snapshot) for name, consume in list(self._consumers.items())))
+        return snapshot
+
+    async def _collect(self, name: str, collector: _Collector) -> Tuple[Any, Optional[str]]:
+        deadline = min(collector.deadline, self.cycle_deadline)
+        try:
+            return await asyncio.wait_for(collector.fetch(), timeout=deadline), None
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Collector {name} missed its {deadline:g}s deadline")
+            return None, f"timed out after {deadline:g}s"
+        except Exception as e:
+            self.logger.error(f"Collector {name} failed: {e}")
+            return None, str(e) or type(e).__name__
+
+    async def _deliver(self, name: str, consume: Callable[[PollSnapshot], Awaitable[None]], snapshot: PollSnapshot) -> None:
+        try:
+            await consume(snapshot)
+        except Exception as e:
+            self.logger.error(f"Consumer {name} failed on cycle {snapshot.cycle}: {e}", exc_info=True)
@@ -0,0 +1,165 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+_DELETED = object()
+
+
+class StateStore:
+    """Embedded SQLite store for state that should survive a restart.
+
+    Values are JSON-encoded and grouped by namespace. Writes never block the
+    caller: the value is encoded on the caller's thread, so later changes to
+    the object are not picked up and bad values fail at ``set``, then lands in a
+    pending map that reads consult first. A writer thread flushes the map in
+    one transaction per interval, so a key updated many times between flushes
+    is written once; the batch being written stays readable until it commits.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 2.0) -> None:
+        self.logger = logging.getLogger("embywatch_bot.state")
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[Tuple[str, str], Any] = {}  # Encoded JSON, or _DELETED
+        self._inflight: Dict[Tuple[str, str], Any] = {}  # Batch the writer is committing
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self._reader = self._connect()
+        self._reader.execute(
+            """
+            CREATE TABLE IF NOT EXISTS state (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._reader.commit()
+
+        self._writer = threading.Thread(target=self._run, name="state-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the stored value, including writes that are not flushed yet."""
+        with self._lock:
+            raw = self._pending.get((namespace, key), self._inflight.get((namespace, key)))
+        if raw is _DELETED:
+            return default
+        if raw is None:
+            row = self._reader.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return default
+            raw = row[0]
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Corrupt state value for {namespace}/{key}: {e}")
+            return default
+
+    def get_all(self, namespace: str) -> Dict[str, Any]:
+        """Return every key in a namespace."""
+        values: Dict[str, Any] = {}
+        for key, raw in self._reader.execute("SELECT key, value FROM state WHERE namespace = ?", (namespace,)):
+            try:
+                values[key] = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+        with self._lock:
+            unflushed = {**self._inflight, **self._pending}
+        for (pending_namespace, key), raw in unflushed.items():
+            if pending_namespace != namespace:
+                continue
+            if raw is _DELETED:
+                values.pop(key, None)
+            else:
+                values[key] = json.loads(raw)
+        return values
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Queue a write; it is persisted on the next flush.
+
+        Raises ``TypeError`` or ``ValueError`` if the value is not JSON-serialisable.
+        """
+        raw = json.dumps(value)
+        with self._lock:
+            self._pending[(namespace, key)] = raw
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Queue a delete; it is persisted on the next flush."""
+        with self._lock:
+            self._pending[(namespace, key)] = _DELETED
+
+    def flush(self) -> None:
+        """Wake the writer thread so pending writes are persisted promptly."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._write_pending(conn)
+                if self._closed:
+                    break
+        finally:
+            conn.close()
+
+    def _write_pending(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+
+        now = time.time()
+        upserts = []
+        deletes = []
+        for (namespace, key), raw in batch.items():
+            if raw is _DELETED:
+                deletes.append((namespace, key))
+            else:
+                upserts.append((namespace, key, raw, now))
+        try:
+            with conn:
+                if upserts:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                        upserts,
+                    )
+                if deletes:
+                    conn.executemany("DELETE FROM state WHERE namespace = ? AND key = ?", deletes)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to persist {len(batch)} state entries: {e}")
+            with self._lock:
+                # Keep newer values that arrived during the failed write
+                self._pending = {**batch, **self._pending}
+                self._inflight = {}
+            return
+        with self._lock:
+            self._inflight = {}
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush outstanding writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout)
+        self._reader.close()
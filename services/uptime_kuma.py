@@ -0,0 +1,358 @@
+import asyncio
+import base64
+import logging
+import math
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from uptime_kuma_api import UptimeKumaApi
+
+from services.singleflight import SingleFlight
+from services.state_store import StateStore
+
+
+# Widest window shown on the dashboard; the narrower ones are sliced out of it
+BEAT_WINDOW_HOURS = 30 * 24
+
+# Pushed beats are written to the state store at most this often (seconds)
+PERSIST_INTERVAL = 300
+
+# MonitorStatus values as stored in the status byte array
+STATUS_DOWN = 0
+STATUS_UP = 1
+
+
+def parse_beat_time(value: str) -> float:
+    """Kuma reports beat times as naive UTC ``YYYY-MM-DD HH:MM:SS[.fff]`` strings."""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+def format_beat_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class BeatSeries:
+    """Heartbeats of one monitor in time order, stored as compact arrays.
+
+    ``times`` holds the beat timestamps, ``statuses`` one status byte per beat
+    (Kuma's ``MonitorStatus`` value) and ``up_prefix[i]`` the running number of
+    UP beats before beat ``i``. Appending a beat extends the running count, so
+    the beats and UP count for any window are a binary search plus a
+    subtraction instead of a scan. Beats older than the retention window are
+    dropped from the front; the prefix keeps working because only differences
+    are used.
+    """
+
+    def __init__(self) -> None:
+        self.times = array("d")
+        self.statuses = array("B")
+        self.up_prefix = array("q", [0])
+        self.last_down: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def last_time(self) -> Optional[float]:
+        return self.times[-1] if self.times else None
+
+    def append(self, timestamp: float, status: int) -> bool:
+        """Add a beat newer than the last one; older or duplicate beats are ignored."""
+        if self.times and timestamp <= self.times[-1]:
+            return False
+        self.times.append(timestamp)
+        self.statuses.append(status)
+        self.up_prefix.append(self.up_prefix[-1] + (status == STATUS_UP))
+        if status == STATUS_DOWN:
+            self.last_down = timestamp
+        return True
+
+    def extend(self, beats: Iterable[Dict[str, Any]]) -> int:
+        """Add raw Kuma beats, keeping only those newer than the last stored one."""
+        parsed = sorted((parse_beat_time(beat["time"]), int(beat["status"].value)) for beat in beats)
+        return sum(self.append(timestamp, status) for timestamp, status in parsed)
+
+    def trim(self, before: float) -> int:
+        """Drop beats older than ``before``."""
+        cut = bisect_left(self.times, before)
+        if cut:
+            del self.times[:cut]
+            del self.statuses[:cut]
+            del self.up_prefix[:cut]
+            if self.last_down is not None and self.last_down < before:
+                self.last_down = None
+        return cut
+
+    def window(self, since: float) -> Tuple[int, int]:
+        """Number of beats and of UP beats at or after ``since``."""
+        start = bisect_left(self.times, since)
+        end = len(self.times)
+        return end - start, self.up_prefix[end] - self.up_prefix[start]
+
+    def uptime(self, period_hours: int, now: float) -> Tuple[float, float]:
+        """Uptime percentage and online minutes over the last ``period_hours``."""
+        total, up = self.window(now - period_hours * 3600)
+        if not total:
+            return 0.0, 0
+        return (up / total) * 100, up * (period_hours * 60 / total)
+
+    def to_state(self) -> Dict[str, str]:
+        """Serialize the arrays for the state store."""
+        return {
+            "times": base64.b64encode(self.times.tobytes()).decode("ascii"),
+            "statuses": base64.b64encode(self.statuses.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, str]) -> "BeatSeries":
+        times = array("d")
+        statuses = array("B")
+        times.frombytes(base64.b64decode(state["times"]))
+        statuses.frombytes(base64.b64decode(state["statuses"]))
+        series = cls()
+        for timestamp, status in zip(times, statuses):
+            series.append(timestamp, status)
+        return series
+
+
+@dataclass(frozen=True)
+class UptimeSnapshot:
+    """Uptime statistics for one monitor and when they were fetched."""
+
+    fetched_at: float
+    uptime_24h: float
+    online_24h: float
+    uptime_7d: float
+    online_7d: float
+    uptime_30d: float
+    online_30d: float
+    last_offline: Optional[str]
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def as_tuple(self) -> Tuple[float, float, float, float, float, float, Optional[str]]:
+        return (
+            self.uptime_24h, self.online_24h, self.uptime_7d, self.online_7d,
+            self.uptime_30d, self.online_30d, self.last_offline,
+        )
+
+
+class UptimeKumaWorker:
+    """Collects Uptime Kuma statistics on a dedicated thread.
+
+    ``UptimeKumaApi`` is a blocking Socket.IO client, so every call to it runs
+    on one worker thread that owns a single logged-in connection for the life
+    of the bot; it is re-established only after an error. Coroutines use
+    :meth:`get`, which serves the cached :class:`UptimeSnapshot` while it is
+    younger than ``max_age`` and otherwise waits for one refresh shared by all
+    callers, so the event loop never blocks on Kuma.
+
+    Beats are kept in a :class:`BeatSeries` that is persisted to the state
+    store, so each refresh only asks Kuma for the hours since the newest beat
+    already held, including after a restart.
+
+    In ``push`` mode the connection also listens for Kuma's ``heartbeat``
+    events for the monitor. Each beat updates the series and snapshot as it
+    arrives, and ``on_status_change`` is called on the event loop whenever the
+    monitor flips between states, so polling is only a fallback.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        monitor_id: int,
+        store: Optional[StateStore] = None,
+        retention_hours: int = BEAT_WINDOW_HOURS,
+        timeout: float = 10.0,
+        push: bool = False,
+        on_status_change: Optional[Callable[[UptimeSnapshot], None]] = None,
+    ) -> None:
+        self.logger = logging.getLogger("embywatch_bot.uptime.worker")
+        self.url = url
+        self.username = username
+        self.password = password
+        self.monitor_id = monitor_id
+        self.timeout = timeout
+        self.store = store
+        self.retention_hours = max(retention_hours, BEAT_WINDOW_HOURS)
+        self.push = push
+        self.on_status_change = on_status_change
+
+        self.series = self._restore()
+        self._last_status: Optional[int] = self.series.statuses[-1] if len(self.series) else None
+        self._dirty = False
+        self._persisted_at = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.snapshot: Optional[UptimeSnapshot] = None
+        self._api: Optional[UptimeKumaApi] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uptime-kuma")
+        self._flights = SingleFlight()
+
+    def start(self) -> None:
+        """Connect in the background so push mode starts listening right away."""
+        self._loop = asyncio.get_running_loop()
+        if self.push:
+            self._executor.submit(self._connect_quietly)
+
+    async def get(self, max_age: float) -> UptimeSnapshot:
+        """Return the cached snapshot if it is fresh enough, refreshing it otherwise."""
+        if self.snapshot is not None and self.snapshot.age < max_age:
+            return self.snapshot
+        return await self.refresh()
+
+    async def refresh(self) -> UptimeSnapshot:
+        """Fetch new statistics on the worker thread; concurrent callers share one fetch."""
+        return await self._flights.do("refresh", self._refresh)
+
+    async def _refresh(self) -> UptimeSnapshot:
+        self._loop = asyncio.get_running_loop()
+        self.snapshot = await self._loop.run_in_executor(self._executor, self._collect)
+        return self.snapshot
+
+    def _connection(self) -> UptimeKumaApi:
+        """Worker thread only: return the logged-in client, connecting if needed."""
+        if self._api is None:
+            api = UptimeKumaApi(self.url, timeout=self.timeout)
+            try:
+                api.login(self.username, self.password)
+            except Exception:
+                api.disconnect()
+                raise
+            self._api = api
+            if self.push:
+                self._subscribe(api)
+            self.logger.info(f"Connected to Uptime Kuma{' (push mode)' if self.push else ''}")
+        return self._api
+
+    def _connect_quietly(self) -> None:
+        """Worker thread only: connect, logging instead of raising."""
+        try:
+            self._connection()
+        except Exception as e:
+            self.logger.warning(f"Could not connect to Uptime Kuma, polling will retry: {e}")
+
+    def _subscribe(self, api: UptimeKumaApi) -> None:
+        """Chain a ``heartbeat`` handler after the one the client library registers."""
+        original = api.sio.handlers.get("/", {}).get("heartbeat")
+
+        def on_heartbeat(data: Any) -> None:
+            if original is not None:
+                original(data)
+            if isinstance(data, dict) and data.get("monitorID") == self.monitor_id:
+                # Socket.IO runs handlers on its own thread; the series belongs to the worker
+                self._executor.submit(self._apply_heartbeat, data)
+
+        api.sio.on("heartbeat", on_heartbeat)
+
+    def _apply_heartbeat(self, data: Dict[str, Any]) -> None:
+        """Worker thread only: add a pushed beat and publish the new snapshot."""
+        try:
+            status = int(getattr(data["status"], "value", data["status"]))
+            timestamp = parse_beat_time(data["time"])
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.debug(f"Ignoring malformed heartbeat: {e}")
+            return
+        if not self.series.append(timestamp, status):
+            return
+        now = time.time()
+        self.series.trim(now - self.retention_hours * 3600)
+        self._dirty = True
+        # Each beat keeps the snapshot fresh, so refreshes stop; save from here instead
+        if time.monotonic() - self._persisted_at >= PERSIST_INTERVAL:
+            self._persist()
+        self.snapshot = self._snapshot(self.series, now)
+
+        changed = self._last_status is not None and status != self._last_status
+        self._last_status = status
+        if changed and self.on_status_change and self._loop is not None:
+            self.logger.info(f"Monitor {self.monitor_id} changed to status {status}")
+            self._loop.call_soon_threadsafe(self.on_status_change, self.snapshot)
+
+    def _drop_connection(self) -> None:
+        """Worker thread only: discard the client so the next call reconnects."""
+        if self._api is not None:
+            try:
+                self._api.disconnect()
+            except Exception as e:
+                self.logger.debug(f"Error disconnecting from Uptime Kuma: {e}")
+            self._api = None
+
+    @property
+    def _store_key(self) -> str:
+        return f"beats:{self.monitor_id}"
+
+    def _restore(self) -> BeatSeries:
+        """Load the persisted beats, if any."""
+        state = self.store.get("uptime", self._store_key) if self.store else None
+        if not state:
+            return BeatSeries()
+        try:
+            series = BeatSeries.from_state(state)
+        except (KeyError, ValueError) as e:
+            self.logger.error(f"Discarding unreadable beat cache: {e}")
+            return BeatSeries()
+        self.logger.info(f"Restored {len(series)} cached beats for monitor {self.monitor_id}")
+        return series
+
+    def _persist(self) -> None:
+        """Worker thread only: save the series to the state store."""
+        if self.store:
+            self.store.set("uptime", self._store_key, self.series.to_state())
+        self._dirty = False
+        self._persisted_at = time.monotonic()
+
+    def _persist_if_dirty(self) -> None:
+        if self._dirty:
+            self._persist()
+
+    def _collect(self) -> UptimeSnapshot:
+        """Worker thread only: fetch beats newer than the newest one held and derive the windows."""
+        now = time.time()
+        last_time = self.series.last_time
+        hours = self.retention_hours
+        if last_time is not None:
+            hours = min(hours, max(1, math.ceil((now - last_time) / 3600)))
+        try:
+            beats = self._connection().get_monitor_beats(self.monitor_id, hours)
+        except Exception:
+            self._drop_connection()
+            raise
+
+        added = self.series.extend(beats)
+        dropped = self.series.trim(now - self.retention_hours * 3600)
+        if added or dropped or self._dirty:
+            self._persist()
+        if len(self.series):
+            self._last_status = self.series.statuses[-1]
+        self.logger.debug(f"Fetched {hours}h of beats: {added} new, {dropped} expired, {len(self.series)} held")
+        return self._snapshot(self.series, now)
+
+    @staticmethod
+    def _snapshot(series: BeatSeries, now: float) -> UptimeSnapshot:
+        uptime_24h, online_24h = series.uptime(24, now)
+        uptime_7d, online_7d = series.uptime(7 * 24, now)
+        uptime_30d, online_30d = series.uptime(BEAT_WINDOW_HOURS, now)
+        last_offline = format_beat_time(series.last_down) if series.last_down is not None else None
+        return UptimeSnapshot(now, uptime_24h, online_24h, uptime_7d, online_7d, uptime_30d, online_30d, last_offline)
+
+    def close(self) -> None:
+        """Save unsaved beats, then disconnect on the worker thread and stop it.
+
+        Waits briefly for the save so it lands before the state store closes.
+        """
+        saved = self._executor.submit(self._persist_if_dirty)
+        try:
+            saved.result(timeout=2)
+        except FutureTimeoutError:
+            self.logger.warning("Worker busy, pushed beats since the last save may be lost")
+        self._executor.submit(self._drop_connection)
+        self._executor.shutdown(wait=False)